@@ -3,6 +3,7 @@
 import sys
 import os
 import pathlib
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -137,7 +138,7 @@ def main():
         out["price"] = out.get("last", 0.0).astype(float)
         out = out[["ticker", "sector", "price", "score", "score_base_sum"]].copy()
         out = out.sort_values("score", ascending=False).reset_index(drop=True)
-        out["rank"] = out.index + 1
+        out["rank"] = np.arange(1, len(out) + 1, dtype=np.int32)
         out["recommendation"] = out["score"].apply(
             lambda s: "BUY" if float(s) > 0 else "PASS"
         )
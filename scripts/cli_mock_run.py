@@ -4,6 +4,7 @@ import sys
 import os
 import pathlib
 import time
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -148,7 +149,7 @@ def main():
             .sort_values("score", ascending=False)
             .reset_index(drop=True)
         )
-        out["rank"] = out.index + 1
+        out["rank"] = np.arange(1, len(out) + 1, dtype=np.int32)
         out["recommendation"] = out["score"].apply(
             lambda s: "BUY" if float(s) > 0 else "PASS"
         )
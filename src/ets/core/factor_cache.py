@@ -0,0 +1,55 @@
+from __future__ import annotations
+import json
+import os
+from typing import Callable, Optional
+
+from ets.util.atomic import write_json_atomic
+
+
+def cache_root(cache_dir: str, *, no_cache: bool = False, dry: bool = False):
+    """Row-cache directory for a run; None disables it (--no-cache, and --dry,
+    which promises no file writes)."""
+    return None if (no_cache or dry) else cache_dir
+
+
+def row_path(cache_dir: str, date_str: str, session: str, ticker: str) -> str:
+    return os.path.join(
+        cache_dir, "factors", date_str, session, f"{ticker.upper().strip()}.json"
+    )
+
+
+def _cacheable(row: Optional[dict]) -> bool:
+    # compute_raw_factors returns an all-zero row when the quote fails;
+    # only rows backed by a real price are worth reusing for the day
+    try:
+        return bool(row) and float(row.get("last") or 0.0) > 0.0
+    except (TypeError, ValueError):
+        return False
+
+
+def load_or_compute(
+    ticker: str,
+    compute: Callable[[str], Optional[dict]],
+    date_str: str,
+    session: str,
+    cache_dir: Optional[str],
+) -> Optional[dict]:
+    """
+    compute(ticker) memoized on disk at <cache_dir>/factors/<date>/<session>/<TICKER>.json.
+    Failed-quote rows are returned but not cached; cache_dir=None always recomputes.
+    """
+    if cache_dir is None:
+        return compute(ticker)
+    path = row_path(cache_dir, date_str, session, ticker)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        pass
+    row = compute(ticker)
+    if _cacheable(row):
+        try:
+            write_json_atomic(path, row, default=float)
+        except Exception:
+            pass
+    return row
@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 from pathlib import Path
 import math
@@ -56,7 +57,15 @@ def finalize_results(scores_path: str, out_dir: str):
     )
     df_f = None
     try:
-        df_f = pd.read_csv(factors_path)
+        pq_path = factors_path[: -len(".csv")] + ".parquet"
+        try:
+            # written alongside the CSV when pyarrow is installed; only trusted
+            # when at least as new as the CSV (a failed write keeps the old one)
+            if os.path.getmtime(pq_path) < os.path.getmtime(factors_path):
+                raise OSError("stale parquet sibling")
+            df_f = pd.read_parquet(pq_path)
+        except Exception:
+            df_f = pd.read_csv(factors_path)
         # normalize key column name to 'symbol' for merge
         f_sym = _find_col(df_f, ["symbol", "ticker", "Symbol", "Ticker"]) or "ticker"
         if f_sym != "symbol":
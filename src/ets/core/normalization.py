@@ -1,3 +1,5 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 
@@ -13,6 +15,40 @@ def _robust_sigmoid(z: np.ndarray) -> np.ndarray:
     return 1.0 / (1.0 + np.exp(-z))
 
 
+def robust_normalize_matrix(
+    X: np.ndarray,
+    p_low=0.10,
+    p_high=0.90,
+    robust=True,
+    clip_min=0.05,
+    clip_max=0.95,
+) -> np.ndarray:
+    """
+    Column-wise robust_normalize_df core on a 2-D float array (rows = tickers,
+    cols = factors): every column is processed in the same NumPy reductions.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.shape[0] == 0:
+        # empty universe (every row gated out): nothing to reduce over
+        return X.copy()
+    with np.errstate(all="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        if not robust:
+            # fallback: min-max
+            mn, mx = np.nanmin(X, axis=0), np.nanmax(X, axis=0)
+            nrm = (X - mn) / np.where(mx > mn, mx - mn, 1.0)
+        else:
+            lo = np.nanquantile(X, p_low, axis=0)
+            hi = np.nanquantile(X, p_high, axis=0)
+            w = np.clip(X, lo, hi)
+            med = np.nanmedian(w, axis=0)
+            # plain median: a NaN in the column propagates, as before
+            mad = np.median(np.abs(w - med), axis=0)
+            mad = np.where(mad > 1e-9, mad, 1e-9)
+            nrm = _robust_sigmoid(0.6745 * (w - med) / mad)
+    return np.clip(nrm, clip_min, clip_max)
+
+
 def robust_normalize_df(
     df: pd.DataFrame,
     cols: list,
@@ -24,20 +60,16 @@ def robust_normalize_df(
 ) -> pd.DataFrame:
     """Winsorize -> robust z via MAD -> sigmoid -> clip [clip_min, clip_max] per column."""
     out = df.copy()
-    n = len(df)
-    for c in cols:
-        x = out[c].astype(float)
-        if n < min_universe_for_robust:
-            # fallback: min-max
-            mn, mx = x.min(), x.max()
-            rng = (mx - mn) if (mx > mn) else 1.0
-            nrm = (x - mn) / rng
-        else:
-            w = _winsorize_series(x, p_low, p_high)
-            med = w.median()
-            mad = np.median(np.abs(w - med))
-            mad = mad if mad > 1e-9 else 1e-9
-            z = 0.6745 * (w - med) / mad
-            nrm = pd.Series(_robust_sigmoid(z), index=w.index)
-        out[c + "_norm"] = nrm.clip(lower=clip_min, upper=clip_max)
+    if not cols:
+        return out
+    nrm = robust_normalize_matrix(
+        out[cols].to_numpy(dtype=np.float64),
+        p_low,
+        p_high,
+        robust=len(df) >= min_universe_for_robust,
+        clip_min=clip_min,
+        clip_max=clip_max,
+    )
+    for j, c in enumerate(cols):
+        out[c + "_norm"] = nrm[:, j]
     return out
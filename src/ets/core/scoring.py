@@ -1,4 +1,5 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 
 # expected normalized column names we’ll combine
@@ -25,8 +26,22 @@ def _safe_sector_series(df):
     return pd.Series(["Unknown"] * len(df), index=df.index)
 
 
-def _get_col(df: pd.DataFrame, name: str):
-    return df[name] if name in df.columns else 0.0
+def _col_arrays(df: pd.DataFrame) -> dict:
+    """Materialize each _COMBOS column once as float64 (missing/NaN -> 0.0)."""
+    n = len(df)
+    return {
+        col: (
+            df[col].to_numpy(dtype=np.float64, na_value=0.0)
+            if col in df.columns
+            else np.zeros(n, dtype=np.float64)
+        )
+        for _, col in _COMBOS
+    }
+
+
+def _score_kernel(X: np.ndarray, W: np.ndarray) -> np.ndarray:
+    """Row-wise dot product of (N, k) factor values and (N, k) weights."""
+    return np.einsum("ij,ij->i", X, W)
 
 
 def compute_scores(
@@ -39,18 +54,24 @@ def compute_scores(
         sec = mult.get(sector, mult.get("_default", {}))
         return float(sec.get(key, 1.0))
 
-    # accumulate weighted sum
-    total = None
-    for key, col in _COMBOS:
-        bw = float(base.get(key, 0.0))
-        vec = _get_col(out, col)
-        # sector multiplier per row
-        sec_mult = _safe_sector_series(out).map(lambda s: w_for(s, key))
-        term = bw * vec * sec_mult
-        total = term if total is None else total + term
+    col_arrays = _col_arrays(out)
+    X = np.column_stack([col_arrays[col] for _, col in _COMBOS])
+
+    # per-sector weight table (base weight * sector multiplier), gathered per row
+    codes, sectors = pd.factorize(_safe_sector_series(out), use_na_sentinel=False)
+    table = np.array(
+        [
+            [float(base.get(key, 0.0)) * w_for(sec, key) for key, _ in _COMBOS]
+            for sec in sectors
+        ],
+        dtype=np.float64,
+    ).reshape(len(sectors), len(_COMBOS))
+    W = table[codes]
 
-    out["score"] = total.fillna(0.0)
+    out["score"] = np.nan_to_num(_score_kernel(X, W), nan=0.0)
 
-    # include a few diagnostics
-    out["score_base_sum"] = sum(float(base.get(k, 0.0)) for k, _ in _COMBOS)
+    # include a few diagnostics (run-level scalar; column kept for CSV consumers)
+    base_sum = float(sum(float(base.get(k, 0.0)) for k, _ in _COMBOS))
+    out.attrs["score_base_sum"] = base_sum
+    out["score_base_sum"] = np.float32(base_sum)
     return out
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 from typing import Sequence
 
@@ -67,16 +68,18 @@ def apply_filters_and_select(
     if "sector" not in df.columns:
         df["sector"] = "Unknown"
 
-    # Apply base filters
+    # Apply base filters — score first (most restrictive), then the rest only
+    # on surviving rows
+    score = df["score"] if "score" in df.columns else pd.Series(0.0, index=df.index)
+    idx = np.flatnonzero(score.to_numpy() >= float(score_threshold))
     ok = (
-        (price >= float(min_price))
-        & (dvol >= float(dollar_volume_floor))
-        & (sigma >= float(risk_floor_sigma_g))
-        & (tau >= float(risk_floor_tau_g))
-        & (df.get("score", 0.0) >= float(score_threshold))
+        (price.to_numpy()[idx] >= float(min_price))
+        & (dvol.to_numpy()[idx] >= float(dollar_volume_floor))
+        & (sigma.to_numpy()[idx] >= float(risk_floor_sigma_g))
+        & (tau.to_numpy()[idx] >= float(risk_floor_tau_g))
     )
 
-    filtered = df[ok].copy()
+    filtered = df.iloc[idx[ok]].copy()
 
     if filtered.empty:
         return filtered
@@ -0,0 +1,34 @@
+import os
+import json
+import time
+import hashlib
+from typing import Any, Optional
+
+from ets.util.atomic import write_json_atomic
+
+_ROOT = os.path.join("cache", "providers")
+
+
+def _path(ns: str, key: str) -> str:
+    h = hashlib.md5(key.encode("utf-8")).hexdigest()
+    return os.path.join(_ROOT, ns, f"{h}.json")
+
+
+def get(ns: str, key: str, ttl: float) -> Optional[Any]:
+    """Return the cached value for key if younger than ttl seconds, else None."""
+    path = _path(ns, key)
+    try:
+        if time.time() - os.path.getmtime(path) >= ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("val")
+    except Exception:
+        return None
+
+
+def put(ns: str, key: str, val: Any) -> None:
+    """Atomically persist val (unique temp file, then os.replace)."""
+    try:
+        write_json_atomic(_path(ns, key), {"ts": time.time(), "key": key, "val": val})
+    except Exception:
+        pass
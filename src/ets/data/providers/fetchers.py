@@ -50,7 +50,26 @@ def _yh_quote(reg: dict, symbol: str) -> Optional[Dict[str, Any]]:
     try:
         import yfinance as yf
 
-        # Try high-frequency snapshot first
+        def _to_float(x):
+            return float(x) if x is not None else None
+
+        # Try lightweight fast_info snapshot first (single JSON call, no frame)
+        try:
+            q = getattr(yf.Ticker(symbol), "fast_info", {}) or {}
+            if q and q.get("last_price") is not None:
+                return {
+                    "c": _to_float(q.get("last_price")),
+                    "h": _to_float(q.get("day_high")),
+                    "l": _to_float(q.get("day_low")),
+                    "o": _to_float(q.get("open")),
+                    "pc": None,
+                    "t": None,
+                    "_src": "yfinance.fast_info",
+                }
+        except Exception:
+            pass
+
+        # Fallback to high-frequency snapshot
         df = yf.download(
             symbol, period="1d", interval="1m", progress=False, threads=False
         )
@@ -65,23 +84,6 @@ def _yh_quote(reg: dict, symbol: str) -> Optional[Dict[str, Any]]:
                 "t": None,
                 "_src": "yfinance.download",
             }
-
-        # Fallback to fast_info
-        q = getattr(yf.Ticker(symbol), "fast_info", {}) or {}
-
-        def _to_float(x):
-            return float(x) if x is not None else None
-
-        if q:
-            return {
-                "c": _to_float(q.get("last_price")),
-                "h": _to_float(q.get("day_high")),
-                "l": _to_float(q.get("day_low")),
-                "o": _to_float(q.get("open")),
-                "pc": None,
-                "t": None,
-                "_src": "yfinance.fast_info",
-            }
     except Exception:
         return None
 
@@ -0,0 +1,36 @@
+from typing import Optional, Dict, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Keep-alive pool per host; sized for concurrent provider racing in quotes_agg
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 64
+
+_BROWSER_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+def pooled_session(
+    headers: Optional[Dict[str, str]] = None, max_retries: Union[int, Retry] = 0
+) -> requests.Session:
+    """requests.Session with an enlarged keep-alive connection pool."""
+    s = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_POOL_CONNECTIONS,
+        pool_maxsize=_POOL_MAXSIZE,
+        max_retries=max_retries,
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    if headers:
+        s.headers.update(headers)
+    return s
+
+
+# Shared by the Yahoo/Stooq/yfinance clients; per-client headers go per request
+SESSION = pooled_session({"User-Agent": _BROWSER_UA, "Connection": "keep-alive"})
@@ -1,5 +1,6 @@
 import os
 import requests
+from .http import pooled_session
 from .rate_limiter import RateLimiter
 from dotenv import load_dotenv
 
@@ -19,7 +20,8 @@ class ProviderRegistry:
         fh = api_cfg.get("finnhub", {"per_second": 30, "per_minute": 60, "reserve": 2})
         self.finnhub = {
             "key": os.getenv("FINNHUB_API_KEY", ""),
-            "session": requests.Session(),
+            # keep-alive pool sized for the concurrent factor workers
+            "session": pooled_session(),
             "limiter": RateLimiter(
                 per_second=int(fh.get("per_second", 30)),
                 per_minute=int(fh.get("per_minute", 60)),
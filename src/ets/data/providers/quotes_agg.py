@@ -1,10 +1,20 @@
 from typing import Optional, List, Dict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import datetime as dt
+import sys
+import threading
 import time
+from zoneinfo import ZoneInfo
+import numpy as np
 from ets.data.providers.yahoo_direct_client import fetch_daily_ohlc as _yd
 from ets.data.providers.yfinance_client import fetch_quote_basic as _yf
 from ets.data.providers.stooq_client import fetch_daily_ohlc as _stq
 from ets.data.providers.finnhub_client import quote as fh_quote
 from ets.data.providers.provider_registry import ProviderRegistry
+from ets.data.providers import _filecache
+from ets.data.providers.rolling import MonotonicDeque
+from ets.core.run_context import get_run_date
 
 _REG: Optional[ProviderRegistry] = None
 
@@ -14,14 +24,70 @@ def set_registry(reg: ProviderRegistry):
     _REG = reg
 
 
-_MEMO: dict[str, dict] = {}
-_PULL_LOG: List[Dict] = []
+class _TTLMemo:
+    """Bounded LRU memo with per-entry TTL (None values are cached misses)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[float, Optional[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        now = time.monotonic()
+        with self._lock:
+            ent = self._data.get(key)
+            if ent is None:
+                return default
+            if now - ent[0] >= self.ttl:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return ent[1]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISS) is not _MISS
+
+    def __setitem__(self, key: str, val: Optional[dict]) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), val)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def update(self, items: Dict[str, Optional[dict]]) -> None:
+        for k, v in items.items():
+            self[k] = v
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_MISS = object()
+_MEMO = _TTLMemo(maxsize=10_000, ttl=300)
+_PULL_LOG: "deque[Dict]" = deque(maxlen=50_000)
+
+# Rolling max latency per provider over the last minute (feeds provider ordering)
+_LATENCY_HORIZON = 60.0
+_LATENCY: Dict[str, MonotonicDeque] = {}
+_LATENCY_LOCK = threading.Lock()
+
+
+def _norm(sym: str) -> str:
+    """Single normalization point; interned so memo keys compare by identity."""
+    return sys.intern(sym.upper().strip())
 
 
 def _log(symbol: str, provider: str, ok: bool, ms: float, note: str = ""):
+    now = time.monotonic()
+    with _LATENCY_LOCK:
+        lat = _LATENCY.setdefault(provider, MonotonicDeque("max"))
+        lat.push(now, ms)
+        lat.expire(now, _LATENCY_HORIZON)
     _PULL_LOG.append(
         {
-            "symbol": symbol.upper().strip(),
+            "symbol": symbol,  # already normalized by _norm
             "provider": provider,
             "ok": int(bool(ok)),
             "latency_ms": round(ms, 1),
@@ -34,6 +100,26 @@ def get_pull_log() -> List[Dict]:
     return list(_PULL_LOG)
 
 
+def rolling_max_latency(provider: str) -> Optional[float]:
+    """Worst latency (ms) seen for provider within the last minute, if any."""
+    with _LATENCY_LOCK:
+        lat = _LATENCY.get(provider)
+        if lat is None:
+            return None
+        lat.expire(time.monotonic(), _LATENCY_HORIZON)
+        return lat.peek()
+
+
+def _by_latency(chain: tuple) -> tuple:
+    """Stable-sort a (name, fn) chain so recently slow providers drift to the back."""
+    return tuple(sorted(chain, key=lambda p: rolling_max_latency(p[0]) or 0.0))
+
+
+def clear_memo() -> None:
+    """Drop all in-process memoized quotes (disk cache is untouched)."""
+    _MEMO.clear()
+
+
 def _valid_bar(q: dict) -> bool:
     try:
         o = float(q.get("open", 0))
@@ -50,59 +136,169 @@ def _valid_bar(q: dict) -> bool:
         return False
 
 
+def _to_float(x) -> float:
+    try:
+        return float(x)
+    except Exception:
+        return np.nan
+
+
+def validate_bars(records: List[Optional[dict]]) -> List[bool]:
+    """Vectorized _valid_bar over many quote dicts (one NumPy pass, no branches)."""
+    if not records:
+        return []
+    keys = ("open", "high", "low", "last")
+    arr = np.fromiter(
+        (_to_float((r or {}).get(k, 0)) for r in records for k in keys),
+        dtype=np.float64,
+        count=len(keys) * len(records),
+    ).reshape(-1, len(keys))
+    o, h, low, c = arr.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        span = np.where(o == 0, np.inf, (h - low) / o)
+    ok = (o > 0) & (h > 0) & (low > 0) & (c > 0) & (low <= h) & (span < 0.2)
+    return ok.tolist()
+
+
 def _from_finnhub(sym: str) -> Optional[dict]:
     if _REG is None:
         return None
-    t0 = time.time()
     q = fh_quote(_REG.finnhub, sym)
     if not q:
-        _log(sym, "finnhub", False, (time.time() - t0) * 1000)
         return None
-    out = {
+    return {
         "open": float(q.get("o") or 0.0),
         "high": float(q.get("h") or 0.0),
         "low": float(q.get("low") or 0.0),
         "last": float(q.get("c") or 0.0),
         "volume": float(q.get("v") or 0.0) if "v" in q else 0.0,
     }
-    ok = _valid_bar(out)
-    _log(sym, "finnhub", ok, (time.time() - t0) * 1000)
-    return out if ok else None
+
+
+# Providers raced concurrently per symbol (first valid bar wins)
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="quotes")
+
+
+def _probe(sym: str, provider: str, fn) -> Optional[dict]:
+    """Time one provider call (monotonic clock), validate and log it."""
+    t0 = time.perf_counter_ns()
+    try:
+        q = fn(sym)
+    except Exception as e:
+        _log(sym, provider, False, (time.perf_counter_ns() - t0) / 1e6, repr(e))
+        return None
+    ok = bool(q and _valid_bar(q))
+    _log(sym, provider, ok, (time.perf_counter_ns() - t0) / 1e6)
+    return q if ok else None
+
+
+# Provider chains resolved once at import: (raced stage, sequential fallbacks).
+# yfinance reads the same upstream as yahoo_direct: only when all else failed.
+_YD = ("yahoo_direct", _yd)
+_STQ = ("stooq", _stq)
+_FH = ("finnhub", _from_finnhub)
+_YF = ("yfinance", _yf)
+
+# Specialized per symbol suffix: non-US listings skip providers that rarely
+# cover them (Stooq/yfinance on LSE/HK), saving failed probes per symbol.
+_CHAINS_BY_SUFFIX: Dict[str, tuple] = {
+    "": ((_YD, _STQ, _FH), (_YF,)),
+    ".US": ((_STQ, _YD, _FH), (_YF,)),
+    ".L": ((_YD, _FH), ()),
+    ".TO": ((_YD, _STQ), (_YF,)),
+    ".HK": ((_YD, _FH), ()),
+}
+
+
+def _chains_for(sym: str) -> tuple:
+    dot = sym.rfind(".")
+    suffix = sym[dot:] if dot > 0 else ""
+    return _CHAINS_BY_SUFFIX.get(suffix, _CHAINS_BY_SUFFIX[""])
+
+
+def _race(sym: str, chain: tuple) -> Optional[dict]:
+    """Run the chain's providers concurrently; return the first valid bar."""
+    if _REG is None:
+        chain = tuple(p for p in chain if p is not _FH)
+    futs = [_POOL.submit(_probe, sym, name, fn) for name, fn in _by_latency(chain)]
+    for fut in as_completed(futs):
+        try:
+            q = fut.result()
+        except Exception:
+            q = None
+        if q:
+            for f in futs:
+                f.cancel()
+            return q
+    return None
+
+
+_NY = ZoneInfo("America/New_York")
+
+
+def _quote_ttl() -> float:
+    """5 min while the US cash session is open, 1 h otherwise (bar is EOD-stable)."""
+    now = dt.datetime.now(_NY)
+    if now.weekday() < 5 and dt.time(9, 30) <= now.time() < dt.time(16, 0):
+        return 300.0
+    return 3600.0
+
+
+def _disk_key(sym: str) -> str:
+    return f"quote:{sym}:{get_run_date(dt.date.today().isoformat())}"
 
 
 def fetch_quote_basic(symbol: str) -> Optional[dict]:
-    s = symbol.upper().strip()
-    if s in _MEMO:
-        return _MEMO[s]
-    q = _from_finnhub(s)
+    s = _norm(symbol)
+    hit = _MEMO.get(s, _MISS)
+    if hit is not _MISS:
+        return hit
+    q = _filecache.get("quotes", _disk_key(s), _quote_ttl())
     if q:
         _MEMO[s] = q
         return q
-    t0 = time.time()
-    q = _yd(s)
-    ok = bool(q and _valid_bar(q))
-    _log(s, "yahoo_direct", ok, (time.time() - t0) * 1000)
-    if ok:
-        _MEMO[s] = q
-        return q
-    t0 = time.time()
-    q = _yf(s)
-    ok = bool(q and _valid_bar(q))
-    _log(s, "yfinance", ok, (time.time() - t0) * 1000)
-    if ok:
-        _MEMO[s] = q
-        return q
-    t0 = time.time()
-    q = _stq(s)
-    ok = bool(q and _valid_bar(q))
-    _log(s, "stooq", ok, (time.time() - t0) * 1000)
-    if ok:
+    raced, fallback = _chains_for(s)
+    q = _race(s, raced)
+    if not q:
+        for name, fn in _by_latency(fallback):
+            q = _probe(s, name, fn)
+            if q:
+                break
+    if q:
         _MEMO[s] = q
+        _filecache.put("quotes", _disk_key(s), q)
         return q
     _MEMO[s] = None
     return None
 
 
+def fetch_quotes_basic(symbols: List[str]) -> Dict[str, Optional[dict]]:
+    """
+    Batch variant of fetch_quote_basic: resolves all un-memoized symbols
+    concurrently so wall clock is bounded by the slowest symbol, not N x providers.
+    """
+    syms = list(dict.fromkeys(_norm(s) for s in symbols))
+    missing = [s for s in syms if s not in _MEMO]
+    results: Dict[str, Optional[dict]] = {}
+    if missing:
+        # warm from disk in one validated pass before touching the network
+        ttl = _quote_ttl()
+        cached = [_filecache.get("quotes", _disk_key(s), ttl) for s in missing]
+        for s, q, ok in zip(missing, cached, validate_bars(cached)):
+            if ok:
+                results[s] = q
+        missing = [s for s in missing if s not in results]
+    if missing:
+        # separate pool from _POOL: each symbol task submits provider tasks there
+        with ThreadPoolExecutor(
+            max_workers=min(8, len(missing)), thread_name_prefix="quotes-batch"
+        ) as ex:
+            results.update(zip(missing, ex.map(fetch_quote_basic, missing)))
+    if results:
+        _MEMO.update(results)
+    return {s: _MEMO.get(s, results.get(s)) for s in syms}
+
+
 def pct_change_today(symbol: str) -> float:
     q = fetch_quote_basic(symbol)
     if not q:
@@ -1,30 +1,46 @@
 from __future__ import annotations
 
+import random
 import threading
 import time
 from collections import deque
-from dataclasses import dataclass
-from typing import Callable, Optional, TypeVar, Deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Optional, Sequence, Tuple, TypeVar
 
 T = TypeVar("T")
 
 
-@dataclass
+@dataclass(slots=True)
 class Window:
     size_sec: float
     capacity: int
 
 
+@dataclass(slots=True)
+class _Ring:
+    """Exact per-window accounting: (timestamp, cost) of calls still inside the window."""
+
+    calls: Deque[Tuple[float, int]] = field(default_factory=deque)
+    used: int = 0
+
+
 class RateLimiter:
     """
     Headroom-aware sliding-window rate limiter with jitterless sleep scheduling.
     Guarantees we never get within `reserve` calls of the max in any window.
 
     - Supports two windows: per-second and per-minute (configurable).
-    - Uses rolling timestamps and computes earliest safe time when headroom is restored.
+    - Per window keeps a ring of (timestamp, cost) entries plus a running
+      total, so usage is exact (bursts at a window edge are counted in full)
+      and memory is bounded by the window capacity.
+    - Earliest safe time is read straight off the ring: the moment enough
+      of the oldest calls expire to make room for `cost`.
     - Thread-safe; low contention (single lock).
     - Works as context manager or via .acquire().
     - Optional `cost` to consume >1 token for a single call.
+    - Legacy (per_second, per_minute) kwargs map to [Window(1, ps), Window(60, pm)];
+      arbitrary windows may be passed directly via `windows`.
+    - Optional `burst` adds extra capacity to the shortest window.
     """
 
     def __init__(
@@ -33,42 +49,52 @@ class RateLimiter:
         per_minute: Optional[int] = None,
         reserve: int = 2,
         name: str = "limiter",
+        *,
+        windows: Optional[Sequence[Window]] = None,
+        burst: int = 0,
     ) -> None:
-        if per_second is None and per_minute is None:
-            raise ValueError("At least one window must be configured")
-
         self.name = name
         self.reserve = max(0, int(reserve))
 
-        self._windows: list[Window] = []
+        self._windows: list[Window] = list(windows or [])
         if per_second:
             self._windows.append(Window(1.0, int(per_second)))
         if per_minute:
             self._windows.append(Window(60.0, int(per_minute)))
+        if not self._windows:
+            raise ValueError("At least one window must be configured")
+        self._windows.sort(key=lambda w: w.size_sec)
+        if burst:
+            w0 = self._windows[0]
+            self._windows[0] = Window(w0.size_sec, w0.capacity + max(0, int(burst)))
 
-        self._buffers: list[Deque[float]] = [deque() for _ in self._windows]
+        self._rings: list[_Ring] = [_Ring() for _ in self._windows]
         self._lock = threading.Lock()
 
     def _prune(self, now: float) -> None:
-        for buf, win in zip(self._buffers, self._windows):
+        for ring, win in zip(self._rings, self._windows):
             cutoff = now - win.size_sec
-            while buf and buf[0] <= cutoff:
-                buf.popleft()
+            calls = ring.calls
+            while calls and calls[0][0] <= cutoff:
+                ring.used -= calls.popleft()[1]
 
     def _next_safe_time(self, now: float, cost: int) -> float:
         earliest = now
-        for buf, win in zip(self._buffers, self._windows):
-            used = len(buf)
+        for ring, win in zip(self._rings, self._windows):
             allowed = max(0, win.capacity - self.reserve)
-            if cost <= 0 or used + cost <= allowed:
+            if cost <= 0 or ring.used + cost <= allowed or ring.used == 0:
                 continue
-            need_to_expire = used + cost - allowed
-            if need_to_expire > len(buf):
-                need_to_expire = len(buf)
-            idx = need_to_expire - 1
-            t_expire = buf[idx] + win.size_sec
-            if t_expire > earliest:
-                earliest = t_expire
+            # oldest calls expire first: wait until enough of them have aged out
+            need = ring.used + cost - allowed
+            freed = 0
+            t_ok = ring.calls[-1][0] + win.size_sec
+            for ts, c in ring.calls:
+                freed += c
+                if freed >= need:
+                    t_ok = ts + win.size_sec
+                    break
+            if t_ok > earliest:
+                earliest = t_ok
         return earliest
 
     def acquire(self, cost: int = 1) -> None:
@@ -80,9 +106,9 @@ class RateLimiter:
                 self._prune(now)
                 t_safe = self._next_safe_time(now, cost)
                 if t_safe <= now:
-                    for buf in self._buffers:
-                        for _ in range(cost):
-                            buf.append(now)
+                    for ring in self._rings:
+                        ring.calls.append((now, cost))
+                        ring.used += cost
                     return
             sleep_for = max(0.0, t_safe - time.monotonic())
             time.sleep(min(0.250, sleep_for) if sleep_for > 0 else 0.001)
@@ -99,14 +125,14 @@ class RateLimiter:
         with self._lock:
             self._prune(now)
             out = {"name": self.name, "reserve": self.reserve, "windows": []}
-            for buf, win in zip(self._buffers, self._windows):
+            for ring, win in zip(self._rings, self._windows):
                 out["windows"].append(
                     {
                         "size_sec": win.size_sec,
                         "capacity": win.capacity,
-                        "used": len(buf),
+                        "used": ring.used,
                         "allowed_used": max(0, win.capacity - self.reserve),
-                        "headroom": max(0, (win.capacity - self.reserve) - len(buf)),
+                        "headroom": max(0, (win.capacity - self.reserve) - ring.used),
                     }
                 )
             return out
@@ -120,9 +146,10 @@ def retry_with_backoff(
     max_sleep: float = 8.0,
 ) -> T:
     """
-    Simple exponential backoff helper for transient failures (no jitter).
+    Exponential backoff with decorrelated jitter for transient failures:
+    sleep = min(max_sleep, uniform(base, prev * 3)).
     """
-    delay = base
+    prev = base
     last_exc = None
     for i in range(attempts):
         try:
@@ -131,7 +158,7 @@ def retry_with_backoff(
             last_exc = exc
             if i == attempts - 1:
                 break
-            time.sleep(delay)
-            delay = min(max_sleep, delay * 2.0)
+            prev = min(max_sleep, random.uniform(base, prev * 3.0))
+            time.sleep(prev)
     assert last_exc is not None
     raise last_exc
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class MonotonicDeque:
+    """
+    Sliding-window max (or min) over timestamped observations.
+
+    - push(ts, value): drop dominated entries from the back, then append.
+    - expire(now, horizon): drop entries older than `horizon` seconds from the front.
+    - peek(): current window extreme (front), or None when empty.
+    Amortized O(1) per observation, O(W) memory.
+    """
+
+    def __init__(self, kind: str = "max") -> None:
+        if kind not in ("max", "min"):
+            raise ValueError("kind must be 'max' or 'min'")
+        self.kind = kind
+        self._q: Deque[Tuple[float, float]] = deque()
+
+    def push(self, ts: float, value: float) -> None:
+        q = self._q
+        if self.kind == "max":
+            while q and q[-1][1] <= value:
+                q.pop()
+        else:
+            while q and q[-1][1] >= value:
+                q.pop()
+        q.append((ts, value))
+
+    def expire(self, now: float, horizon: float) -> None:
+        cutoff = now - horizon
+        q = self._q
+        while q and q[0][0] <= cutoff:
+            q.popleft()
+
+    def peek(self) -> Optional[float]:
+        return self._q[0][1] if self._q else None
+
+    def __len__(self) -> int:
+        return len(self._q)
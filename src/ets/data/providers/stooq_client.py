@@ -1,18 +1,64 @@
-import io
 import time
-import requests
-import csv
-
-_SESSION = requests.Session()
-_SESSION.headers.update(
-    {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "text/csv,*/*;q=0.1",
-        "Connection": "keep-alive",
-    }
-)
+import datetime as dt
+from ets.data.providers.http import SESSION as _SESSION
+from ets.data.providers.rate_limiter import RateLimiter
+
+_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept": "text/csv,*/*;q=0.1"}
 _RETRIES = 3
 _BACKOFF = 0.6
+# smooth bursts from batched quote fan-out (reserve 1: the per-second window is small)
+_LIMITER = RateLimiter(per_second=3, per_minute=60, reserve=1, name="stooq")
+
+
+def _last_row(text: str) -> dict:
+    """Header + final line of a Stooq CSV as a dict; no full-history parse."""
+    text = text.strip()
+    first_nl = text.find("\n")
+    if first_nl < 0:
+        return {}
+    header = text[:first_nl].strip().split(",")
+    last = text[text.rfind("\n") + 1 :].strip().split(",")
+    return dict(zip(header, last))
+
+
+def _header_only(text: str) -> bool:
+    """A CSV header with no data rows (symbol known, nothing in the window)."""
+    text = text.strip()
+    return "\n" not in text and text.startswith("Date,")
+
+
+def _get_csv(url: str):
+    """Body of a Stooq CSV request; None on 4xx, "No data"/404 pages or errors."""
+    for i in range(_RETRIES):
+        try:
+            with _LIMITER:
+                r = _SESSION.get(url, headers=_HEADERS, timeout=8)
+            if r.status_code >= 500:
+                time.sleep(_BACKOFF * (i + 1))
+                continue
+            if r.status_code >= 400 or not r.text or "404 Not Found" in r.text:
+                return None
+            return r.text
+        except Exception:
+            time.sleep(_BACKOFF * (i + 1))
+    return None
+
+
+def _parse_bar(text: str):
+    row = _last_row(text)
+    # Skip if missing values
+    if not row.get("Open") or not row.get("Close"):
+        return None
+    try:
+        return {
+            "open": float(row["Open"]),
+            "high": float(row["High"]),
+            "low": float(row["Low"]),
+            "last": float(row["Close"]),
+            "volume": float(row.get("Volume") or 0.0),
+        }
+    except (KeyError, ValueError):
+        return None
 
 
 def _try_stooq(symbol: str):
@@ -24,34 +70,22 @@ def _try_stooq(symbol: str):
         candidates = [s, s.replace(".", "-") + ".us"]
     else:
         candidates = [f"{s}.us", s]
+    # Only the last few sessions are needed; bracket the request by date. The
+    # full history is fetched only when the window is a bare header (symbol
+    # exists, no rows in range); "No data"/404 moves on to the next candidate.
+    today = dt.datetime.now(dt.timezone.utc).date()
+    start = today - dt.timedelta(days=10)
+    window = f"&d1={start:%Y%m%d}&d2={today:%Y%m%d}"
     for cand in candidates:
-        for i in range(_RETRIES):
-            try:
-                url = f"https://stooq.com/q/d/l/?s={cand}&i=d"
-                r = _SESSION.get(url, timeout=8)
-                if r.status_code >= 500:
-                    time.sleep(_BACKOFF * (i + 1))
-                    continue
-                r.raise_for_status()
-                if not r.text or "404 Not Found" in r.text:
-                    break
-                f = io.StringIO(r.text.strip())
-                reader = list(csv.DictReader(f))
-                if not reader:
-                    break
-                row = reader[-1]
-                # Skip if missing values
-                if not row.get("Open") or not row.get("Close"):
-                    break
-                return {
-                    "open": float(row["Open"]),
-                    "high": float(row["High"]),
-                    "low": float(row["Low"]),
-                    "last": float(row["Close"]),
-                    "volume": float(row.get("Volume") or 0.0),
-                }
-            except Exception:
-                time.sleep(_BACKOFF * (i + 1))
+        text = _get_csv(f"https://stooq.com/q/d/l/?s={cand}{window}&i=d")
+        if text is None:
+            continue
+        bar = _parse_bar(text)
+        if bar is None and _header_only(text):
+            text = _get_csv(f"https://stooq.com/q/d/l/?s={cand}&i=d")
+            bar = _parse_bar(text) if text else None
+        if bar is not None:
+            return bar
     return None
 
 
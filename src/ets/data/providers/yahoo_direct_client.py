@@ -1,19 +1,27 @@
 import time
-import requests
+import json
+import numpy as np
+from ets.data.providers.http import SESSION as _SESSION
+from ets.data.providers.rate_limiter import RateLimiter
 
-_SESSION = requests.Session()
-_SESSION.headers.update(
-    {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-        "Accept": "application/json,text/plain,*/*",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Connection": "keep-alive",
-    }
-)
+# Faster chart JSON parsing when orjson is available (parses bytes directly)
+try:
+    import orjson  # type: ignore
+
+    _loads = orjson.loads
+except Exception:
+    _loads = json.loads
+
+_HEADERS = {
+    "Accept": "application/json,text/plain,*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+}
 
 _BASE = "https://query2.finance.yahoo.com/v8/finance/chart"
 _RETRIES = 3
 _BACKOFF = 0.8
+# smooth bursts from batched quote fan-out
+_LIMITER = RateLimiter(per_second=5, per_minute=100, reserve=2, name="yahoo_direct")
 
 
 def fetch_daily_ohlc(symbol: str):
@@ -26,12 +34,15 @@ def fetch_daily_ohlc(symbol: str):
     }
     for i in range(_RETRIES):
         try:
-            r = _SESSION.get(f"{_BASE}/{symbol}", params=params, timeout=8)
+            with _LIMITER:
+                r = _SESSION.get(
+                    f"{_BASE}/{symbol}", params=params, headers=_HEADERS, timeout=8
+                )
             if r.status_code >= 500:
                 time.sleep(_BACKOFF * (i + 1))
                 continue
             r.raise_for_status()
-            j = r.json()
+            j = _loads(r.content)
             res = (j.get("chart") or {}).get("result") or []
             if not res:
                 time.sleep(_BACKOFF * (i + 1))
@@ -47,23 +58,22 @@ def fetch_daily_ohlc(symbol: str):
             # find last non-None candle
             if not c:
                 return None
-            idx = None
-            for k in range(len(c) - 1, -1, -1):
-                if (
-                    c[k] is not None
-                    and o[k] is not None
-                    and h[k] is not None
-                    and low[k] is not None
-                ):
-                    idx = k
-                    break
-            if idx is None:
+            # None -> nan on float64 conversion
+            ao, ah, al, ac = (
+                np.array(a or [], dtype=np.float64) for a in (o, h, low, c)
+            )
+            if not (len(ao) == len(ah) == len(al) == len(ac)):
+                return None
+            valid = ~(np.isnan(ao) | np.isnan(ah) | np.isnan(al) | np.isnan(ac))
+            nz = np.flatnonzero(valid)
+            if nz.size == 0:
                 return None
+            idx = int(nz[-1])
             return {
-                "open": float(o[idx]),
-                "high": float(h[idx]),
-                "low": float(low[idx]),
-                "last": float(c[idx]),
+                "open": float(ao[idx]),
+                "high": float(ah[idx]),
+                "low": float(al[idx]),
+                "last": float(ac[idx]),
                 "volume": float((v[idx] if v else 0) or 0.0),
             }
         except Exception:
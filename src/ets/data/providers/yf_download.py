@@ -0,0 +1,13 @@
+import threading
+import yfinance as yf
+
+# yfinance 0.2.x (the pinned version) collects download() results in the
+# module-global shared._DFS and resets it on every call, so two downloads in
+# flight clobber each other. Concurrent callers download through here.
+_LOCK = threading.Lock()
+
+
+def download(*args, **kwargs):
+    """yf.download, one call at a time per process (threads=True fans out inside)."""
+    with _LOCK:
+        return yf.download(*args, **kwargs)
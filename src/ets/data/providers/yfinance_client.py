@@ -1,91 +1,79 @@
-import time
-import io
-import sys
-import contextlib
+import logging
 from typing import Optional
-import requests
+import pandas as pd
 import yfinance as yf
+from ets.data.providers import yf_download
+from ets.data.providers.http import SESSION as _SESSION
+from ets.data.providers.rate_limiter import RateLimiter, retry_with_backoff
 
-# ---- Robust session: browser UA + retry on transient failures ----
-_SESSION = requests.Session()
-_SESSION.headers.update(
-    {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/124.0.0.0 Safari/537.36"
-    }
-)
+# ---- Shared pooled session (browser UA) + retry on transient failures ----
 _RETRIES = 2  # keep light to avoid spammy retries
-_BACKOFF = 0.8  # seconds
+_BACKOFF = 0.5  # seconds (base for retry_with_backoff)
+_MAX_BACKOFF = 2.0
+# smooth bursts from batched quote fan-out (same Yahoo limits as yahoo_direct)
+_LIMITER = RateLimiter(per_second=5, per_minute=100, reserve=2, name="yfinance")
 
 
-@contextlib.contextmanager
-def _suppress_prints():
-    """Silence yfinance prints ('Failed to get ticker', JSONDecodeError chatter)."""
-    new_out, new_err = io.StringIO(), io.StringIO()
-    old_out, old_err = sys.stdout, sys.stderr
-    try:
-        sys.stdout, sys.stderr = new_out, new_err
-        yield
-    finally:
-        sys.stdout, sys.stderr = old_out, old_err
+# yfinance reports failures ('Failed to get ticker', JSONDecodeError chatter)
+# through logging; silence once at import instead of per call.
+for _name in ("yfinance", "peewee"):
+    logging.getLogger(_name).setLevel(logging.CRITICAL)
+
+
+def _last_bar(df: Optional[pd.DataFrame]) -> dict:
+    """Last complete OHLCV row; raises on an empty frame so callers retry."""
+    if df is None or df.empty:
+        raise ValueError("empty frame")
+    row = df.dropna().iloc[-1]
+    return {
+        "open": float(row["Open"]),
+        "high": float(row["High"]),
+        "low": float(row["Low"]),
+        "last": float(row["Close"]),
+        "volume": float(row.get("Volume", 0.0) or 0.0),
+    }
+
 
+def _one_download(symbol: str) -> dict:
+    """yf.download of the last full daily bar; silenced via logging at import."""
+    with _LIMITER:
+        df = yf_download.download(
+            tickers=symbol,
+            period="2d",  # last full row, even across a weekend
+            interval="1d",
+            auto_adjust=False,
+            progress=False,
+            prepost=False,
+            session=_SESSION,
+            threads=False,
+        )
+    return _last_bar(df)
 
-def _download_1d_1d(symbol: str) -> Optional[dict]:
-    """Use yf.download, but silence prints and handle errors."""
-    for i in range(_RETRIES):
-        try:
-            with _suppress_prints():
-                df = yf.download(
-                    tickers=symbol,
-                    period="5d",  # improve odds of at least 1 full row
-                    interval="1d",
-                    auto_adjust=False,
-                    progress=False,
-                    prepost=False,
-                    session=_SESSION,
-                    threads=False,
-                )
-            if df is not None and not df.empty:
-                row = df.dropna().iloc[-1]
-                return {
-                    "open": float(row["Open"]),
-                    "high": float(row["High"]),
-                    "low": float(row["Low"]),
-                    "last": float(row["Close"]),
-                    "volume": float(row.get("Volume", 0.0) or 0.0),
-                }
-        except Exception:
-            pass
-        time.sleep(_BACKOFF * (i + 1))
-    return None
+
+def _one_history(symbol: str) -> dict:
+    """Ticker.history (silenced via logging)."""
+    t = yf.Ticker(symbol, session=_SESSION)
+    with _LIMITER:
+        day = t.history(period="2d", interval="1d", prepost=False)
+    return _last_bar(day)
+
+
+def _with_retry(fn, symbol: str) -> Optional[dict]:
+    try:
+        return retry_with_backoff(
+            lambda: fn(symbol),
+            attempts=_RETRIES,
+            base=_BACKOFF,
+            max_sleep=_MAX_BACKOFF,
+        )
+    except Exception:
+        return None
 
 
 def fetch_quote_basic(ticker: str) -> Optional[dict]:
     """
     Returns dict: last, open, high, low, volume
-    Robust against Yahoo quirks (silenced + retries).
+    Robust against Yahoo quirks (silenced + retries). Both download and the
+    Ticker.history fallback request period="2d" (only the last bar is used).
     """
-    data = _download_1d_1d(ticker)
-    if data:
-        return data
-
-    # Final fallback: Ticker.history (also silenced)
-    for i in range(_RETRIES):
-        try:
-            with _suppress_prints():
-                t = yf.Ticker(ticker, session=_SESSION)
-                day = t.history(period="5d", interval="1d", prepost=False)
-            if day is not None and not day.empty:
-                row = day.dropna().iloc[-1]
-                return {
-                    "last": float(row["Close"]),
-                    "open": float(row["Open"]),
-                    "high": float(row["High"]),
-                    "low": float(row["Low"]),
-                    "volume": float(row.get("Volume", 0.0) or 0.0),
-                }
-        except Exception:
-            pass
-        time.sleep(_BACKOFF * (i + 1))
-    return None
+    return _with_retry(_one_download, ticker) or _with_retry(_one_history, ticker)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, Optional
+
+from urllib3.util.retry import Retry
+
+from ets.data.providers import _filecache
+from ets.data.providers.http import pooled_session
+
+_NS = "http"
+_SECRET_PARAMS = {"token", "apikey", "api_key"}
+
+# Keep-alive session for the factor APIs (Finnhub); transient 429/5xx are
+# retried by urllib3 before falling through to the caller's None
+_SESSION = pooled_session(
+    max_retries=Retry(
+        total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)
+    )
+)
+
+
+def _key(url: str, params: Optional[Dict[str, Any]]) -> str:
+    # credentials never go into the cache key (or onto disk)
+    items = sorted(
+        (k, str(v)) for k, v in (params or {}).items() if k not in _SECRET_PARAMS
+    )
+    return json.dumps([url, items])
+
+
+def get_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    ttl_sec: float = 3600.0,
+    timeout: float = 10.0,
+    limiter=None,
+) -> Optional[Any]:
+    """
+    GET url and return the decoded JSON body, served from cache/providers/http
+    while younger than ttl_sec. Non-200 responses return None and are not cached.
+    limiter (a RateLimiter) gates only the network request, not cache hits.
+    """
+    key = _key(url, params)
+    hit = _filecache.get(_NS, key, ttl_sec)
+    if hit is not None:
+        return hit
+    if limiter is not None:
+        limiter.acquire()
+    r = _SESSION.get(url, params=params, timeout=timeout)
+    if r.status_code != 200:
+        return None
+    data = r.json()
+    _filecache.put(_NS, key, data)
+    return data
@@ -4,6 +4,7 @@ import time
 
 from ets.data.providers.provider_registry import ProviderRegistry
 from ets.data.providers.finnhub_client import earnings_calendar
+from ets.data.providers import _filecache
 from ets.core.run_context import get_run_date
 
 FALLBACK_PEERS: list[str] | None = None
@@ -16,6 +17,7 @@ def set_fallback_peers(symbols: list[str] | None):
 
 _REG: Optional[ProviderRegistry] = None
 _CACHE: dict[str, dict] = {}  # date -> {"ts": time.time(), "events": [..]}
+_TTL = 600  # seconds; shared by the in-process dict and the on-disk copy
 
 
 def set_registry(reg: ProviderRegistry):
@@ -25,11 +27,16 @@ def set_registry(reg: ProviderRegistry):
 
 def _fetch_day(date_str: str) -> List[Dict]:
     """
-    Fetch earnings for a single YYYY-MM-DD day from Finnhub, cached for 10 minutes.
+    Fetch earnings for a single YYYY-MM-DD day from Finnhub, cached for 10 minutes
+    in-process and on disk (survives restarts).
     """
     now = time.time()
     ent = _CACHE.get(date_str)
-    if ent and (now - ent.get("ts", 0)) < 600:
+    if ent and (now - ent.get("ts", 0)) < _TTL:
+        return ent["events"]
+    ent = _filecache.get("calendar", date_str, _TTL)
+    if ent and (now - ent.get("ts", 0)) < _TTL:
+        _CACHE[date_str] = ent
         return ent["events"]
 
     if _REG is None:
@@ -61,6 +68,7 @@ def _fetch_day(date_str: str) -> List[Dict]:
             {"symbol": s, "date": date_str, "session": "amc"} for s in FALLBACK_PEERS
         ]
     _CACHE[date_str] = {"ts": now, "events": out}
+    _filecache.put("calendar", date_str, _CACHE[date_str])
     return out
 
 
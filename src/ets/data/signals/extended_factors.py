@@ -1,13 +1,53 @@
 from __future__ import annotations
 import os
 import math
+import threading
+import time
 import datetime as dt
-from typing import Dict, Optional
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import numpy as np
 import yfinance as yf
 
+from ets.data.providers import yf_download
+from ets.data.providers.provider_registry import ProviderRegistry
+from ets.data.providers.quotes_agg import fetch_quote_basic
+from ets.data.providers.rate_limiter import RateLimiter
+from ets.data.signals import _httpcache
+
 UTC = dt.timezone.utc
 
+# On-disk TTLs for the Finnhub-backed factors (seconds)
+_INSIDER_TTL = 6 * 3600
+_NEWS_TTL = 3600
+_CALENDAR_TTL = 12 * 3600
+
+# Finnhub requests share the registry's RateLimiter once set_registry() is
+# called; until then a module limiter with the free-tier defaults gates them
+_REG: Optional[ProviderRegistry] = None
+_FALLBACK_LIMITER = RateLimiter(
+    per_second=30, per_minute=60, reserve=2, name="finnhub-ext"
+)
+
+
+def set_registry(reg: ProviderRegistry):
+    global _REG
+    _REG = reg
+
+
+def _finnhub_limiter() -> RateLimiter:
+    if _REG is not None:
+        return _REG.finnhub["limiter"]
+    return _FALLBACK_LIMITER
+
+
+# Independent network-bound sub-fetches run concurrently per symbol
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ext-factors")
+# Cross-symbol Finnhub fan-out; bounded like a connection limit, separate from
+# _POOL so bulk callers never wait on their own per-symbol workers
+_BULK_POOL = ThreadPoolExecutor(max_workers=20, thread_name_prefix="ext-bulk")
+
 
 def _today_ymd() -> str:
     return dt.datetime.now(UTC).strftime("%Y-%m-%d")
@@ -39,24 +79,108 @@ def _yf_info(t: yf.Ticker) -> dict:
     return info or {}
 
 
-def _last_price(t: yf.Ticker) -> Optional[float]:
-    # fast path
+# One Ticker per symbol shared across the factor helpers (bounded; call
+# _ticker.cache_clear() in long-running processes)
+@lru_cache(maxsize=128)
+def _ticker(sym: str) -> yf.Ticker:
+    return yf.Ticker(sym)
+
+
+# info / last-price memos keep successful lookups only: a failed fetch ({} or
+# None) is retried on the next call instead of sticking for the process
+_MEMO_MAX = 128
+_MEMO_LOCK = threading.Lock()
+_INFO_TTL = 3600.0
+_INFO_CACHE: Dict[str, Tuple[float, dict]] = {}
+_PRICE_TTL = 300.0
+_PRICE_CACHE: Dict[str, Tuple[float, float]] = {}
+
+
+def _memo_ok(cache: dict, sym: str, ttl: float, fetch):
+    now = time.time()
+    with _MEMO_LOCK:
+        hit = cache.get(sym)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+    v = fetch(sym)
+    if v:
+        with _MEMO_LOCK:
+            cache.pop(sym, None)
+            if len(cache) >= _MEMO_MAX:
+                del cache[next(iter(cache))]  # oldest insert
+            cache[sym] = (now, v)
+    return v
+
+
+def _info_cached(sym: str) -> dict:
+    return _memo_ok(_INFO_CACHE, sym, _INFO_TTL, lambda s: _yf_info(_ticker(s)))
+
+
+def _fetch_last_price(sym: str) -> Optional[float]:
+    # fast path: fast_info fields, no bar download
     try:
-        fi = getattr(t, "fast_info", None)
-        if fi and "last_price" in fi:
-            v = _safe_float(fi["last_price"])
+        fi = _ticker(sym).fast_info
+        for k in ("last_price", "previous_close", "regular_market_previous_close"):
+            try:
+                v = _safe_float(fi[k])
+            except Exception:
+                v = None
             if v is not None:
                 return v
     except Exception:
         pass
-    # fallback: recent close
+    # fallback: the memoized/disk-cached quote chain instead of a 5d history pull
     try:
-        hist = t.history(period="5d", interval="1d")
-        if len(hist) > 0:
-            return _safe_float(hist["Close"].iloc[-1])
+        q = fetch_quote_basic(sym)
+        return _safe_float(q.get("last")) if q else None
     except Exception:
-        pass
-    return None
+        return None
+
+
+def _last_price(sym: str) -> Optional[float]:
+    return _memo_ok(_PRICE_CACHE, sym, _PRICE_TTL, _fetch_last_price)
+
+
+_BULK_CHUNK = 20  # Yahoo accepts up to 20 symbols per chart request
+
+
+def _chunk_last_prices(chunk: list) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    try:
+        df = yf_download.download(
+            chunk,
+            period="2d",
+            interval="1d",
+            group_by="ticker",
+            progress=False,
+            threads=True,
+        )
+    except Exception:
+        return out
+    for sym in chunk:
+        try:
+            frame = df[sym] if sym in df.columns.get_level_values(0) else df
+            close = frame["Close"].dropna()
+            v = _safe_float(close.iloc[-1]) if len(close) else None
+        except Exception:
+            v = None
+        if v is not None:
+            out[sym] = v
+    return out
+
+
+def bulk_last_prices(symbols) -> Dict[str, float]:
+    """
+    Last daily close for many symbols at once: one yf.download per chunk of
+    _BULK_CHUNK symbols. Chunks run one after another in the calling thread
+    (see yf_download); yfinance threads the tickers inside each call.
+    Missing symbols are omitted.
+    """
+    syms = list(dict.fromkeys(s for s in symbols if s))
+    out: Dict[str, float] = {}
+    for i in range(0, len(syms), _BULK_CHUNK):
+        out.update(_chunk_last_prices(syms[i : i + _BULK_CHUNK]))
+    return out
 
 
 def factor_fundamentals(sym: str) -> Dict[str, Optional[float]]:
@@ -64,8 +188,8 @@ def factor_fundamentals(sym: str) -> Dict[str, Optional[float]]:
     EPSG, ROE, PEG, DE — from Yahoo free endpoints via yfinance.
     All real values; returns None for any missing -> caller will enforce completeness.
     """
-    t = yf.Ticker(sym)
-    info = _yf_info(t)
+    t = _ticker(sym)
+    info = _info_cached(sym)
     out: Dict[str, Optional[float]] = {
         "EPSG": None,
         "ROE": None,
@@ -96,8 +220,7 @@ def factor_short_interest(sym: str) -> Dict[str, Optional[float]]:
     """
     SI — Short interest % of float from Yahoo; real number if available.
     """
-    t = yf.Ticker(sym)
-    info = _yf_info(t)
+    info = _info_cached(sym)
     si = None
     # Prefer shortPercentOfFloat
     si = _safe_float(info.get("shortPercentOfFloat"))
@@ -110,11 +233,24 @@ def factor_short_interest(sym: str) -> Dict[str, Optional[float]]:
     return {"SI": si}
 
 
-def factor_options_skew(sym: str) -> Dict[str, Optional[float]]:
+def _atm_median_iv(chain, lo: float, hi: float) -> Optional[float]:
+    # plain ndarray mask + nanmedian: no DataFrame copies on the per-symbol path
+    strike = chain["strike"].to_numpy(dtype=np.float64, na_value=np.nan)
+    iv = chain["impliedVolatility"].to_numpy(dtype=np.float64, na_value=np.nan)
+    iv = iv[(strike >= lo) & (strike <= hi)]
+    if iv.size == 0 or np.isnan(iv).all():
+        return None
+    return _safe_float(np.nanmedian(iv))
+
+
+def factor_options_skew(
+    sym: str, last_price: Optional[float] = None
+) -> Dict[str, Optional[float]]:
     """
     OPT_SK — Call IV minus Put IV around ATM for nearest expiry using Yahoo options via yfinance.
+    Pass last_price (e.g. from bulk_last_prices) to skip the per-symbol price lookup.
     """
-    t = yf.Ticker(sym)
+    t = _ticker(sym)
     try:
         exps = list(getattr(t, "options", []) or [])
         if not exps:
@@ -122,21 +258,16 @@ def factor_options_skew(sym: str) -> Dict[str, Optional[float]]:
         exp = exps[0]
         chain = t.option_chain(exp)
         calls, puts = chain.calls, chain.puts
-        last = _last_price(t)
+        last = _safe_float(last_price)
+        if last is None:
+            last = _last_price(sym)
         if last is None or calls.empty or puts.empty:
             return {"OPT_SK": None}
-        lo, hi = 0.9 * last, 1.1 * last
-        c = calls[(calls["strike"] >= lo) & (calls["strike"] <= hi)]
-        p = puts[(puts["strike"] >= lo) & (puts["strike"] <= hi)]
-        if (
-            c.empty
-            or p.empty
-            or "impliedVolatility" not in c
-            or "impliedVolatility" not in p
-        ):
+        if "impliedVolatility" not in calls or "impliedVolatility" not in puts:
             return {"OPT_SK": None}
-        c_iv = _safe_float(c["impliedVolatility"].median())
-        p_iv = _safe_float(p["impliedVolatility"].median())
+        lo, hi = 0.9 * last, 1.1 * last
+        c_iv = _atm_median_iv(calls, lo, hi)
+        p_iv = _atm_median_iv(puts, lo, hi)
         if c_iv is None or p_iv is None:
             return {"OPT_SK": None}
         return {"OPT_SK": c_iv - p_iv}
@@ -158,14 +289,13 @@ def factor_insider(sym: str) -> Dict[str, Optional[float]]:
             "to": _today_ymd(),
             "token": key,
         }
-        r = requests.get(
+        data = _httpcache.get_json(
             "https://finnhub.io/api/v1/stock/insider-transactions",
-            params=params,
-            timeout=10,
+            params,
+            ttl_sec=_INSIDER_TTL,
+            limiter=_finnhub_limiter(),
         )
-        if r.status_code != 200:
-            return {"INSIDER": None}
-        data = r.json() or {}
+        data = data or {}
         trs = data.get("data") or []
         buys = sum(
             float(x.get("change") or 0.0)
@@ -210,6 +340,29 @@ _NEG = {
 }
 
 
+# Single-pass multi-pattern headline scan when pyahocorasick is available
+try:
+    import ahocorasick  # type: ignore
+
+    _LEXICON = ahocorasick.Automaton()
+    for _w in _POS:
+        _LEXICON.add_word(_w, (1, _w))
+    for _w in _NEG:
+        _LEXICON.add_word(_w, (-1, _w))
+    _LEXICON.make_automaton()
+except Exception:
+    _LEXICON = None
+
+
+def _headline_score(h: str) -> int:
+    # each lexicon word counts once per headline, however often it occurs
+    if _LEXICON is not None:
+        return sum(sign for sign, _ in {v for _, v in _LEXICON.iter(h)})
+    # str.__contains__ is a C fastsearch; measured faster here than one regex
+    # alternation scan or bytes.count over the encoded headline
+    return sum(1 for w in _POS if w in h) - sum(1 for w in _NEG if w in h)
+
+
 def factor_news_sentiment(sym: str) -> Dict[str, Optional[float]]:
     """
     NEWS — very lightweight lexicon score from Finnhub company-news headlines (free).
@@ -219,36 +372,61 @@ def factor_news_sentiment(sym: str) -> Dict[str, Optional[float]]:
         return {"NEWS": None}
     try:
         params = {"symbol": sym, "from": _days_ago(7), "to": _today_ymd(), "token": key}
-        r = requests.get(
-            "https://finnhub.io/api/v1/company-news", params=params, timeout=10
+        arts = _httpcache.get_json(
+            "https://finnhub.io/api/v1/company-news",
+            params,
+            ttl_sec=_NEWS_TTL,
+            limiter=_finnhub_limiter(),
         )
-        if r.status_code != 200:
-            return {"NEWS": None}
-        arts = r.json() or []
+        arts = arts or []
         if not arts:
             return {"NEWS": None}
         score = 0
         for a in arts:
-            h = (a.get("headline") or "").lower()
-            score += sum(1 for w in _POS if w in h)
-            score -= sum(1 for w in _NEG if w in h)
+            score += _headline_score((a.get("headline") or "").lower())
         return {"NEWS": float(score)}
     except Exception:
         return {"NEWS": None}
 
 
+_MACRO_TTL = 300.0  # seconds; RISK_APP is market-wide, identical for every symbol
+_MACRO_CACHE: Dict[str, object] = {"t": 0.0, "v": None}
+_MACRO_LOCK = threading.Lock()
+
+
+def _last_return(frame) -> float:
+    # last two valid closes only; avoids a full pct_change (and its NaN padding)
+    c = frame["Close"].dropna().to_numpy()
+    return float(c[-1] / c[-2] - 1.0) if c.size >= 2 else math.nan
+
+
 def factor_macro() -> Dict[str, Optional[float]]:
     """
     RISK_APP — XLY/XLU relative; LIQ — proxy from spread% * volume using Yahoo.
-    RISK_APP is market-wide, not per-symbol.
+    RISK_APP is market-wide, not per-symbol: successful readings are memoized
+    for _MACRO_TTL seconds and fetched with a single batched download for both ETFs.
     """
-    try:
-        xly = yf.Ticker("XLY").history(period="10d")["Close"].pct_change().iloc[-1]
-        xlu = yf.Ticker("XLU").history(period="10d")["Close"].pct_change().iloc[-1]
-        risk = float(xly - xlu)
-    except Exception:
-        risk = None
-    return {"RISK_APP": risk}
+    with _MACRO_LOCK:
+        fresh = time.time() - _MACRO_CACHE["t"] < _MACRO_TTL
+        if fresh and _MACRO_CACHE["v"] is not None:
+            return dict(_MACRO_CACHE["v"])
+        try:
+            df = yf_download.download(
+                ["XLY", "XLU"],
+                period="10d",
+                interval="1d",
+                group_by="ticker",
+                progress=False,
+                threads=False,
+            )
+            risk = _safe_float(_last_return(df["XLY"]) - _last_return(df["XLU"]))
+        except Exception:
+            risk = None
+        out = {"RISK_APP": risk}
+        # only a real reading is memoized; a failed download retries next call
+        if risk is not None:
+            _MACRO_CACHE.update(t=time.time(), v=out)
+        return dict(out)
 
 
 def factor_liquidity_from_ohlcv(
@@ -267,33 +445,48 @@ def factor_liquidity_from_ohlcv(
     return {"LIQ": None}
 
 
-def factor_eat_from_calendar(sym: str) -> Dict[str, Optional[float]]:
-    """
-    EAT — Earnings Announcement Timing (BMO/AMC proximity) via Finnhub calendar.
-    Uses today's schedule; returns +1 for AMC, -1 for BMO when known, else None.
-    """
+def _earnings_calendar_today() -> Optional[list]:
+    """Today's Finnhub earnings calendar rows (disk-cached); None if unavailable."""
     key = os.getenv("FINNHUB_API_KEY") or os.getenv("FINNHUB_TOKEN")
     if not key:
-        return {"EAT": None}
+        return None
     try:
         d = _today_ymd()
-        url = "https://finnhub.io/api/v1/calendar/earnings"
-        r = requests.get(url, params={"from": d, "to": d, "token": key}, timeout=10)
-        if r.status_code != 200:
-            return {"EAT": None}
-        rows = r.json().get("earningsCalendar", []) or []
-        for row in rows:
-            if (row.get("symbol") or "").upper().strip() == sym.upper():
-                # Finnhub sometimes provides "hour": "bmo" or "amc" or times
-                sess = (row.get("hour") or row.get("time") or "").lower()
-                if "amc" in sess:
-                    return {"EAT": 1.0}
-                if "bmo" in sess:
-                    return {"EAT": -1.0}
-                return {"EAT": 0.0}  # same day but unknown time (still real)
-        return {"EAT": None}
+        data = _httpcache.get_json(
+            "https://finnhub.io/api/v1/calendar/earnings",
+            {"from": d, "to": d, "token": key},
+            ttl_sec=_CALENDAR_TTL,
+            limiter=_finnhub_limiter(),
+        )
+        if data is None:
+            return None
+        return data.get("earningsCalendar", []) or []
     except Exception:
-        return {"EAT": None}
+        return None
+
+
+def factor_eat_from_calendar(
+    sym: str, rows: Optional[list] = None
+) -> Dict[str, Optional[float]]:
+    """
+    EAT — Earnings Announcement Timing (BMO/AMC proximity) via Finnhub calendar.
+    Uses today's schedule; returns +1 for AMC, -1 for BMO when known, else None.
+    Pass rows (from _earnings_calendar_today) to reuse one calendar fetch.
+    """
+    if rows is None:
+        rows = _earnings_calendar_today()
+        if rows is None:
+            return {"EAT": None}
+    for row in rows:
+        if (row.get("symbol") or "").upper().strip() == sym.upper():
+            # Finnhub sometimes provides "hour": "bmo" or "amc" or times
+            sess = (row.get("hour") or row.get("time") or "").lower()
+            if "amc" in sess:
+                return {"EAT": 1.0}
+            if "bmo" in sess:
+                return {"EAT": -1.0}
+            return {"EAT": 0.0}  # same day but unknown time (still real)
+    return {"EAT": None}
 
 
 def compute_extended_factors(
@@ -303,12 +496,16 @@ def compute_extended_factors(
     Returns real values (or None) for: EPSG, ROE, PEG, DE, SI, OPT_SK, INSIDER, NEWS, RISK_APP, LIQ, EAT.
     """
     out: Dict[str, Optional[float]] = {}
-    out.update(factor_fundamentals(sym))
-    out.update(factor_short_interest(sym))
-    out.update(factor_options_skew(sym))
-    out.update(factor_insider(sym))
-    out.update(factor_news_sentiment(sym))
-    out.update(factor_macro())
+    futs = [
+        _POOL.submit(factor_fundamentals, sym),
+        _POOL.submit(factor_short_interest, sym),
+        _POOL.submit(factor_options_skew, sym, ohlcv.get("last")),
+        _POOL.submit(factor_insider, sym),
+        _POOL.submit(factor_news_sentiment, sym),
+        _POOL.submit(factor_macro),
+        _POOL.submit(factor_eat_from_calendar, sym),
+    ]
+    # pure CPU: inline
     out.update(
         factor_liquidity_from_ohlcv(
             ohlcv.get("open"),
@@ -318,5 +515,37 @@ def compute_extended_factors(
             ohlcv.get("volume"),
         )
     )
-    out.update(factor_eat_from_calendar(sym))
+    for fut in as_completed(futs):
+        out.update(fut.result())
+    return out
+
+
+def _finnhub_factors(sym: str, calendar: Optional[list]) -> Dict[str, Optional[float]]:
+    out: Dict[str, Optional[float]] = {}
+    out.update(factor_insider(sym))
+    out.update(factor_news_sentiment(sym))
+    out.update(
+        factor_eat_from_calendar(sym, calendar)
+        if calendar is not None
+        else {"EAT": None}
+    )
     return out
+
+
+def compute_extended_factors_bulk(symbols) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    INSIDER, NEWS, EAT and OPT_SK for many symbols. The day's earnings calendar
+    and the OPT_SK last prices are fetched once up front; the per-symbol fetches
+    then run at most 20 in flight on _BULK_POOL, every Finnhub request still
+    gated by the Finnhub RateLimiter. Returns {sym: factors}.
+    """
+    syms = list(dict.fromkeys(s for s in symbols if s))
+    prices = bulk_last_prices(syms)
+    calendar = _earnings_calendar_today()
+
+    def _one(sym: str) -> Dict[str, Optional[float]]:
+        out = _finnhub_factors(sym, calendar)
+        out.update(factor_options_skew(sym, prices.get(sym)))
+        return out
+
+    return dict(zip(syms, _BULK_POOL.map(_one, syms)))
@@ -1,44 +1,53 @@
 from __future__ import annotations
 import os
-import csv
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Iterable
+import pandas as pd
 from ets.data.providers.provider_registry import ProviderRegistry
 from ets.data.providers.finnhub_client import profile2
 
+_MAX_WORKERS = 10
+
 
 def load_sector_cache(cache_dir: str = "cache") -> Dict[str, str]:
     path = os.path.join(cache_dir, "sectors.csv")
-    out: Dict[str, str] = {}
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            for r in csv.reader(f):
-                if len(r) >= 2:
-                    out[str(r[0]).upper()] = r[1]
-    return out
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return {}
+    # str dtype + no NA parsing: tickers like "NA" must stay strings
+    df = pd.read_csv(
+        path,
+        header=None,
+        names=["sym", "sec"],
+        index_col=False,
+        dtype=str,
+        keep_default_na=False,
+        engine="c",
+    ).fillna("")
+    df = df[df["sec"] != ""]
+    return dict(zip(df["sym"].str.upper(), df["sec"]))
 
 
 def save_sector_cache(mapping: Dict[str, str], cache_dir: str = "cache"):
     os.makedirs(cache_dir, exist_ok=True)
     path = os.path.join(cache_dir, "sectors.csv")
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        for k, v in sorted(mapping.items()):
-            w.writerow([k, v])
+    pd.DataFrame(sorted(mapping.items())).to_csv(path, index=False, header=False)
 
 
 def autofill_sectors(
     symbols: Iterable[str], reg: ProviderRegistry, cache_dir: str = "cache"
 ) -> Dict[str, str]:
     cache = load_sector_cache(cache_dir)
-    updated = False
-    for s in symbols:
-        u = str(s).upper().strip()
-        if not u or u in cache:
-            continue
-        prof = profile2(reg.finnhub, u) or {}
-        sec = prof.get("finnhubIndustry") or prof.get("sector") or "Unknown"
-        cache[u] = sec
-        updated = True
-    if updated:
-        save_sector_cache(cache, cache_dir)
+    todo = list(
+        dict.fromkeys(u for u in (str(s).upper().strip() for s in symbols) if u)
+    )
+    todo = [u for u in todo if u not in cache]
+    if not todo:
+        return cache
+    # reg.finnhub's RateLimiter gates every profile2 call, so the pool only
+    # overlaps round-trips; it cannot push past the free-tier quota
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+        profs = ex.map(lambda u: profile2(reg.finnhub, u) or {}, todo)
+        for u, prof in zip(todo, profs):
+            cache[u] = prof.get("finnhubIndustry") or prof.get("sector") or "Unknown"
+    save_sector_cache(cache, cache_dir)
     return cache
@@ -3,9 +3,12 @@ import time
 import json
 from typing import Optional
 from pytrends.request import TrendReq
+from ets.util.atomic import write_json_atomic
 
 _CACHE = os.path.join("cache", "trends")
 ALLOWLIST = None  # set at runtime from config if provided
+_TTL = 7 * 24 * 3600
+_MEM: dict[str, tuple[float, float]] = {}  # KEYWORD -> (fetched_ts, avg_interest)
 os.makedirs(_CACHE, exist_ok=True)
 
 
@@ -14,15 +17,21 @@ def _cache_path(keyword: str) -> str:
 
 
 def search_interest(keyword: str, lookback_days: int = 365) -> Optional[float]:
-    if ALLOWLIST is not None and keyword.upper() not in ALLOWLIST:
+    k = keyword.upper()
+    if ALLOWLIST is not None and k not in ALLOWLIST:
         return 0.0
-    path = _cache_path(keyword)
     now = time.time()
-    if os.path.exists(path) and (now - os.path.getmtime(path) < 7 * 24 * 3600):
+    hit = _MEM.get(k)
+    if hit and now - hit[0] < _TTL:
+        return hit[1]
+    path = _cache_path(keyword)
+    if os.path.exists(path) and (now - os.path.getmtime(path) < _TTL):
         try:
             with open(path, "r", encoding="utf-8") as f:
                 obj = json.load(f)
-                return float(obj.get("avg_interest", 0.0))
+            val = float(obj.get("avg_interest", 0.0))
+            _MEM[k] = (float(obj.get("ts", now)), val)
+            return val
         except Exception:
             pass
     try:
@@ -32,8 +41,8 @@ def search_interest(keyword: str, lookback_days: int = 365) -> Optional[float]:
         )
         df = pytrends.interest_over_time()
         val = 0.0 if df is None or df.empty else float(df[keyword].tail(52).mean())
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump({"avg_interest": val, "ts": now}, f)
+        _MEM[k] = (now, val)
+        write_json_atomic(path, {"avg_interest": val, "ts": now})
         return val
     except Exception:
         return 0.0
@@ -41,4 +50,4 @@ def search_interest(keyword: str, lookback_days: int = 365) -> Optional[float]:
 
 def set_allowlist(symbols: list[str] | None):
     global ALLOWLIST
-    ALLOWLIST = [s.upper() for s in symbols] if symbols else None
+    ALLOWLIST = frozenset(s.upper() for s in symbols) if symbols else None
@@ -1,7 +1,9 @@
 from __future__ import annotations
+import os
 from pathlib import Path
 from typing import List, Dict
 import pandas as pd
+from pandas.tseries.offsets import BDay
 import sys
 
 # Free data
@@ -14,6 +16,14 @@ except Exception:
 OUT_DIR = Path("out")
 DAILY_DIR = OUT_DIR / "cache" / "daily"
 FACTORS_CSV = OUT_DIR / "factors_latest.csv"
+# set by build_factors: builders stage their column here instead of rewriting
+# factors_latest.csv once per factor
+STAGE_ENV = "ETS_FACTORS_STAGE"
+_OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+# Yahoo rejects/truncates very large multi-ticker calls: cap the batch size.
+# Batches run one after another: yfinance 0.2.x collects download() results in
+# the module-global shared._DFS, so concurrent calls clobber each other.
+_BATCH = 100
 
 
 def read_symbols(symbols_arg: str | None) -> List[str]:
@@ -58,59 +68,145 @@ def load_daily_cache(symbol: str) -> pd.DataFrame | None:
     return None
 
 
+def is_fresh(df: pd.DataFrame | None, min_rows: int) -> bool:
+    """
+    Cached bars are usable when there are at least min_rows of them and the
+    last bar is no older than the previous business day.
+    """
+    if df is None or len(df) < min_rows:
+        return False
+    cutoff = pd.Timestamp.today().normalize() - BDay(1)
+    last = df.index[-1]
+    if getattr(last, "tzinfo", None) is not None:
+        last = last.tz_localize(None)
+    return last >= cutoff
+
+
 def save_daily_cache(symbol: str, df: pd.DataFrame) -> None:
     DAILY_DIR.mkdir(parents=True, exist_ok=True)
     (DAILY_DIR / f"{symbol}.parquet").unlink(missing_ok=True)
     df.to_parquet(DAILY_DIR / f"{symbol}.parquet")
 
 
-def fetch_daily_batch(
-    symbols: List[str], lookback_days: int = 35
-) -> dict[str, pd.DataFrame]:
-    """Batch-download daily bars from Yahoo; returns dict[symbol] -> df(OHLCV)."""
-    if not symbols:
-        return {}
-    df = yf.download(
-        symbols,
-        period=f"{max(lookback_days,30)}d",
-        interval="1d",
-        progress=False,
-        threads=False,
-        group_by="ticker",
-        auto_adjust=False,
-    )
+def _split_daily(df: pd.DataFrame, symbols: List[str]) -> dict[str, pd.DataFrame]:
     out: dict[str, pd.DataFrame] = {}
     if isinstance(df.columns, pd.MultiIndex):
         for sym in symbols:
             sub = df.get(sym)
             if sub is None or sub.empty:
                 continue
-            sub = sub[["Open", "High", "Low", "Close", "Volume"]].copy()
+            # union index across tickers: drop dates this symbol didn't trade
+            sub = sub[_OHLCV].dropna(how="all")
+            if sub.empty:
+                continue
             sub.index = pd.to_datetime(sub.index)
             out[sym] = sub
-    else:
-        sub = df[["Open", "High", "Low", "Close", "Volume"]].copy()
+    elif not df.empty:
+        sub = df[_OHLCV]  # column selection is already a new frame
         sub.index = pd.to_datetime(sub.index)
         out[symbols[0]] = sub
     return out
 
 
-def update_factors_csv(
-    symbols: List[str], column: str, values: Dict[str, float]
-) -> None:
+def _download_daily(symbols: List[str], period: str) -> pd.DataFrame:
+    return yf.download(
+        symbols,
+        period=period,
+        interval="1d",
+        progress=False,
+        threads=True,
+        group_by="ticker",
+        auto_adjust=False,
+    )
+
+
+def fetch_daily_batch(
+    symbols: List[str], lookback_days: int = 35
+) -> dict[str, pd.DataFrame]:
+    """
+    Batch-download daily bars from Yahoo; returns dict[symbol] -> df(OHLCV).
+    Multi-ticker requests of up to _BATCH symbols, one at a time (yfinance
+    threads the per-ticker fetches inside each call); symbols that come back empty
+    are retried once individually, also one at a time.
+    """
+    if not symbols:
+        return {}
+    period = f"{max(lookback_days,30)}d"
+    chunks = [symbols[i : i + _BATCH] for i in range(0, len(symbols), _BATCH)]
+
+    def _chunk(c: List[str]) -> dict[str, pd.DataFrame]:
+        try:
+            return _split_daily(_download_daily(c, period), c)
+        except Exception:
+            return {}
+
+    out: dict[str, pd.DataFrame] = {}
+    for c in chunks:
+        out.update(_chunk(c))
+    # empty slices: single-symbol retries, sequential for the same shared._DFS reason
+    for sym in [s for s in symbols if s not in out]:
+        out.update(_chunk([sym]))
+    return out
+
+
+def _apply_columns(df: pd.DataFrame, column: str, values: Dict[str, float]) -> None:
+    # in-place column update via a hash lookup; no merge copy / _x,_y columns
+    new = df["symbol"].map(values)
+    df[column] = new.fillna(df[column]) if column in df.columns else new
+
+
+def _write_factors(df: pd.DataFrame) -> None:
+    tmp = FACTORS_CSV.with_suffix(".csv.tmp")
+    df.to_csv(tmp, index=False)
+    tmp.replace(FACTORS_CSV)
+
+
+def _read_factors(symbols: List[str]) -> pd.DataFrame:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     if FACTORS_CSV.exists():
         df = pd.read_csv(FACTORS_CSV)
     else:
         df = pd.DataFrame({"symbol": symbols})
     df["symbol"] = df["symbol"].astype(str).str.upper()
-    upd = pd.DataFrame({"symbol": list(values.keys()), column: list(values.values())})
-    df = df.merge(upd, on="symbol", how="left")
-    # Resolve potential _x/_y if column existed
-    if f"{column}_x" in df.columns and f"{column}_y" in df.columns:
-        df[column] = df[f"{column}_y"].fillna(df[f"{column}_x"])
-        df.drop(columns=[f"{column}_x", f"{column}_y"], inplace=True)
-    if column not in df.columns:
-        df[column] = 0.0
-    df.to_csv(FACTORS_CSV, index=False)
+    return df
+
+
+def update_factors_csv(
+    symbols: List[str], column: str, values: Dict[str, float]
+) -> None:
+    stage = os.getenv(STAGE_ENV)
+    if stage:
+        # batch run (build_factors): stage the one column; flush_staged_factors
+        # merges every staged column in a single rewrite
+        d = Path(stage)
+        d.mkdir(parents=True, exist_ok=True)
+        syms = list(dict.fromkeys([*symbols, *values]))
+        part = pd.DataFrame({"symbol": syms, "value": [values.get(x) for x in syms]})
+        tmp = d / f"{column}.csv.tmp"
+        part.to_csv(tmp, index=False)
+        tmp.replace(d / f"{column}.csv")
+        print(f"[OK] staged {column} | rows={len(part)}")
+        return
+    df = _read_factors(symbols)
+    _apply_columns(df, column, values)
+    _write_factors(df)
     print(f"[OK] wrote {FACTORS_CSV} (+{column}) | rows={len(df)}")
+
+
+def flush_staged_factors(stage: Path) -> None:
+    """Apply staged factor columns (in staging order) with one read and one write."""
+    parts = sorted(stage.glob("*.csv"), key=lambda p: p.stat().st_mtime_ns)
+    if not parts:
+        return
+    df = None
+    for p in parts:
+        part = pd.read_csv(p)
+        syms = part["symbol"].astype(str).str.upper()
+        if df is None:
+            df = _read_factors(syms.tolist())
+        _apply_columns(df, p.stem, dict(zip(syms, part["value"])))
+    _write_factors(df)
+    for p in parts:
+        p.unlink(missing_ok=True)
+    cols = ", ".join(p.stem for p in parts)
+    print(f"[OK] wrote {FACTORS_CSV} (+{cols}) | rows={len(df)}")
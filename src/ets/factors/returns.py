@@ -0,0 +1,40 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+
+def log_rets_np(close: pd.Series, window: int) -> np.ndarray:
+    """
+    ndarray twin of np.log(c / c.shift(1)).tail(window) over the non-NaN closes:
+    histories of <= window closes keep the leading NaN slot, so front-aligned
+    rows line up with the pandas version.
+    """
+    a = close.to_numpy(dtype=np.float64)
+    a = a[~np.isnan(a)][-(window + 1) :]
+    r = np.full(len(a), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r[1:] = np.log(a[1:] / a[:-1])
+    return r[-window:] if window > 0 else r[:0]
+
+
+def corr_rows(R: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """
+    Pearson corr of each row of R with d, over pairwise-complete (non-NaN)
+    points as Series.corr does; undefined correlations -> 0.0.
+    """
+    M = ~(np.isnan(R) | np.isnan(d))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if M.all():
+            # no gaps: centre once and use a BLAS mat-vec for the covariances
+            rc = R - R.mean(axis=1, keepdims=True)
+            dc = d - d.mean()
+            c = (rc @ dc) / np.sqrt(np.einsum("ij,ij->i", rc, rc) * (dc @ dc))
+        else:
+            n = M.sum(axis=1, keepdims=True)
+            rc = np.where(M, R - np.where(M, R, 0.0).sum(axis=1, keepdims=True) / n, 0)
+            dc = np.where(M, d - np.where(M, d, 0.0).sum(axis=1, keepdims=True) / n, 0)
+            c = (rc * dc).sum(axis=1) / np.sqrt(
+                (rc * rc).sum(axis=1) * (dc * dc).sum(axis=1)
+            )
+    c[~np.isfinite(c)] = 0.0
+    return c
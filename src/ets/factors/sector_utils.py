@@ -1,10 +1,24 @@
 from __future__ import annotations
+import json
 from pathlib import Path
 from typing import Dict
 import pandas as pd
 import yaml
 
 OUT_DIR = Path("out")
+CACHE_DIR = OUT_DIR / "cache"
+ETF_MAP_YAML = Path("src/ets/config/sector_etf_map.yaml")
+
+# libyaml parser when available (same output as safe_load)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _fresh(cache: Path, src: Path) -> bool:
+    """Parsed-copy cache is valid while it is at least as new as its source."""
+    try:
+        return cache.stat().st_mtime >= src.stat().st_mtime
+    except OSError:
+        return False
 
 
 def load_sector_profile() -> pd.DataFrame:
@@ -12,14 +26,37 @@ def load_sector_profile() -> pd.DataFrame:
     p = OUT_DIR / "sector_profile.csv"
     if not p.exists():
         return pd.DataFrame(columns=["symbol", "sector"])
+    cache = CACHE_DIR / "sector_profile.pkl"
+    if _fresh(cache, p):
+        try:
+            return pd.read_pickle(cache)
+        except Exception:
+            pass
     df = pd.read_csv(p)
     df["symbol"] = df["symbol"].astype(str).str.upper()
     df["sector"] = df["sector"].fillna("Unknown")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(cache)
+    except Exception:
+        pass
     return df
 
 
 def load_sector_etf_map() -> Dict[str, str]:
-    p = Path("src/ets/config/sector_etf_map.yaml")
+    p = ETF_MAP_YAML
     if not p.exists():
         return {}
-    return yaml.safe_load(p.read_text()) or {}
+    cache = CACHE_DIR / "sector_etf_map.json"
+    if _fresh(cache, p):
+        try:
+            return json.loads(cache.read_text())
+        except Exception:
+            pass
+    m = yaml.load(p.read_text(), Loader=_YAML_LOADER) or {}
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache.write_text(json.dumps(m))
+    except Exception:
+        pass
+    return m
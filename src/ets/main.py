@@ -36,22 +36,25 @@ _print_mode_banner()
 import sys
 import argparse
 import logging
-import time
-import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from types import MappingProxyType
 
 import pandas as pd
 
 # --- Project / internal imports
 from ets.config.defaults import DEFAULT_WEIGHTS
 from ets.util.dicts import deep_merge
+from ets.util.sector_csv import read_sector_csv
 from ets.core.utils import load_yaml, run_id, ensure_dirs
 from ets.data.calendar import from_finnhub, from_csv
 from ets.core.factors import compute_raw_factors
+from ets.core.factor_cache import cache_root, load_or_compute
 from ets.core.normalization import robust_normalize_df
 from ets.core.scoring import compute_scores
 from ets.core.selection import apply_filters_and_select
-from ets.outputs.csv_writer import write_factors, write_pulls
+from ets.outputs.csv_writer import rows_to_columns, write_factors, write_pulls
 from ets.outputs.telemetry import write_telemetry
 from ets.core.env import load_env, require_env
 from ets.data.signals.calendar_loader import set_fallback_peers
@@ -64,6 +67,43 @@ from ets.data.signals.calendar_loader import set_registry as set_calendar_regist
 logging.getLogger("yfinance").setLevel(logging.ERROR)
 logging.getLogger("urllib3").setLevel(logging.ERROR)
 
+_FACTOR_WORKERS = 8  # concurrent compute_raw_factors calls
+
+# Phase-2 CORE factors (required) in normalization order; other *_raw columns
+# follow, sorted
+CORE_ORDER = (
+    "M_raw",
+    "V_raw",
+    "S_raw",
+    "A_raw",
+    "sigma_raw",
+    "tau_raw",
+    "CAL_raw",
+    "SRM_raw",
+    "PEER_raw",
+    "ETFF_raw",
+    "VIX_raw",
+    "TREND_raw",
+)
+CORE_SET = frozenset(CORE_ORDER)
+OPTIONAL_FACTORS = (
+    "EPSG_raw",
+    "ROE_raw",
+    "PEG_raw",
+    "DE_raw",
+    "SI_raw",
+    "OPT_SK_raw",
+    "INSIDER_raw",
+    "NEWS_raw",
+    "RISK_APP_raw",
+    "LIQ_raw",
+    "EAT_raw",
+)
+# *_raw_norm -> *_norm for the fixed CORE set
+CORE_RENAME = MappingProxyType(
+    {c + "_norm": c.replace("_raw", "") + "_norm" for c in CORE_ORDER}
+)
+
 # -------- Defaults to avoid KeyError on cfg[...] ----------
 DEFAULT_CFG = {
     "app": {"out_dir": "out", "logs_dir": "logs", "cache_dir": "cache"},
@@ -94,7 +134,9 @@ def _coerce_base(base_val, norm_cols):
     If base_val is scalar, broadcast to all factor keys inferred from norm_cols.
     norm_cols are like ["M_raw","V_raw",...]; we strip "_raw" to get keys.
     """
-    factor_keys = [c.replace("_raw", "") for c in (norm_cols or [])]
+    if isinstance(base_val, dict):
+        return base_val
+    factor_keys = [c[:-4] if c.endswith("_raw") else c for c in (norm_cols or [])]
     if not factor_keys:
         factor_keys = [
             "M",
@@ -110,13 +152,17 @@ def _coerce_base(base_val, norm_cols):
             "VIX",
             "TREND",
         ]
-    if isinstance(base_val, dict):
-        return base_val
     try:
         scalar = float(base_val)
     except Exception:
         scalar = 1.0
-    return {k: scalar for k in factor_keys}
+    return _broadcast(scalar, tuple(factor_keys))
+
+
+@lru_cache(maxsize=16)
+def _broadcast(scalar: float, keys: tuple) -> MappingProxyType:
+    # read-only view: the memoized mapping is shared between callers
+    return MappingProxyType({k: scalar for k in keys})
 
 
 # ---------- Helpers ----------
@@ -154,6 +200,11 @@ def parse_args():
         action="store_true",
         help="Run deterministic pipeline without live API calls or writes.",
     )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute raw factors instead of reusing cache/factors/<date>/<session>/.",
+    )
     return ap.parse_args()
 
 
@@ -181,27 +232,32 @@ def load_configs():
     return cfg, wts
 
 
+def _cached_compute(
+    t: str,
+    sector_map: dict,
+    date_str: str,
+    cache_dir: str | None = "cache",
+    session: str = "amc",
+) -> dict | None:
+    """
+    compute_raw_factors memoized on disk at
+    <cache_dir>/factors/<date>/<session>/<TICKER>.json (see ets.core.factor_cache).
+    """
+    return load_or_compute(
+        t, lambda x: compute_raw_factors(x, sector_map), date_str, session, cache_dir
+    )
+
+
 def _load_sector_map_from_cache(cache_dir: str = "cache") -> dict:
     """
     Read cache/sectors.csv if present. Format: TICKER,SECTOR (no header required).
     Returns dict like {'AAPL': 'Information Technology', ...}
     """
     path = os.path.join(cache_dir, "sectors.csv")
-    mapping = {}
-    if os.path.exists(path):
-        try:
-            with open(path, "r", newline="", encoding="utf-8") as f:
-                rdr = csv.reader(f)
-                for row in rdr:
-                    if not row:
-                        continue
-                    t = str(row[0]).strip().upper()
-                    s = (row[1] if len(row) > 1 else "Unknown").strip()
-                    if t:
-                        mapping[t] = s
-        except Exception:
-            pass
-    return mapping
+    try:
+        return dict(read_sector_csv(path, os.path.getmtime(path)))
+    except Exception:
+        return {}
 
 
 def build_universe(
@@ -223,36 +279,9 @@ def _phase2_gate(factors_df: pd.DataFrame) -> pd.DataFrame:
     - Require only CORE free, reliable factors
     - Allow OPTIONAL factors; do not fail if missing
     """
-    CORE = [
-        "M_raw",
-        "V_raw",
-        "S_raw",
-        "A_raw",
-        "sigma_raw",
-        "tau_raw",
-        "CAL_raw",
-        "SRM_raw",
-        "PEER_raw",
-        "ETFF_raw",
-        "VIX_raw",
-        "TREND_raw",
-    ]
-    OPTIONAL = [
-        "EPSG_raw",
-        "ROE_raw",
-        "PEG_raw",
-        "DE_raw",
-        "SI_raw",
-        "OPT_SK_raw",
-        "INSIDER_raw",
-        "NEWS_raw",
-        "RISK_APP_raw",
-        "LIQ_raw",
-        "EAT_raw",
-    ]
-
     # Structural check: all CORE columns must exist in the frame
-    missing_cols = [c for c in CORE if c not in factors_df.columns]
+    missing = CORE_SET.difference(factors_df.columns)
+    missing_cols = [c for c in CORE_ORDER if c in missing]
     if missing_cols:
         raise SystemExit(
             f"[FATAL] Missing required CORE factor columns: {missing_cols}"
@@ -260,19 +289,19 @@ def _phase2_gate(factors_df: pd.DataFrame) -> pd.DataFrame:
 
     # Drop rows with any null in CORE factors (strict)
     before = len(factors_df)
-    factors_df = factors_df.dropna(subset=CORE)
+    core_ok = factors_df[list(CORE_ORDER)].notna().to_numpy().all(axis=1)
+    factors_df = factors_df.loc[core_ok].reset_index(drop=True)
     dropped = before - len(factors_df)
     if dropped > 0:
         print(f"[INFO] Dropped {dropped} ticker(s) lacking full CORE factor coverage.")
 
     # Optional coverage stats (purely informative)
-    opt_present = [c for c in OPTIONAL if c in factors_df.columns]
+    opt_present = [c for c in OPTIONAL_FACTORS if c in factors_df.columns]
     if opt_present:
-        factors_df["_optional_count"] = factors_df[opt_present].notna().sum(axis=1)
+        # local array only: no helper column written back into the frame
+        opt_count = factors_df[opt_present].notna().to_numpy().sum(axis=1)
         present_n = len(opt_present)
-        mean_cov = (
-            float(factors_df["_optional_count"].mean()) if len(factors_df) else 0.0
-        )
+        mean_cov = float(opt_count.mean()) if len(opt_count) else 0.0
         print(
             f"[INFO] OPTIONAL factors available this run: {present_n} -> {opt_present}"
         )
@@ -328,20 +357,25 @@ def main():
         print("No tickers found from calendar or CSV. Provide --tickers path.")
         return 0
 
-    # 2) Raw factors (gentle throttle to reduce upstream 429s even with limiter)
-    raw_rows = []
-    for idx, t in enumerate(universe):
-        row = compute_raw_factors(t, sector_map)
-        if row:
-            raw_rows.append(row)
-        if idx % 3 == 0:
-            time.sleep(0.20)
+    # 2) Raw factors — network-bound per ticker, so fan out; upstream pacing is
+    # left to the per-provider RateLimiters. map() keeps universe order.
+    cache_dir = cache_root(cfg["app"]["cache_dir"], no_cache=args.no_cache, dry=dry_run)
+    with ThreadPoolExecutor(max_workers=_FACTOR_WORKERS) as ex:
+        rows = ex.map(
+            lambda t: _cached_compute(
+                t, sector_map, args.date, cache_dir, args.session
+            ),
+            universe,
+        )
+        raw_rows = [row for row in rows if row]
 
     if not raw_rows:
         print("No factor rows computed.")
         return 0
 
-    factors_df = pd.DataFrame(raw_rows)
+    # columnar (dict of lists) so the frame wraps each list without per-row
+    # schema inference
+    factors_df = pd.DataFrame(rows_to_columns(raw_rows), copy=False)
 
     # 2b) Phase-2 completeness gate (Tiered Strictness)
     factors_df = _phase2_gate(factors_df)
@@ -359,22 +393,8 @@ def main():
 
     # 3) Normalize — dynamic column list (CORE first, then any other *_raw present)
     norm_cols = [c for c in factors_df.columns if c.endswith("_raw")]
-    CORE_ORDER = [
-        "M_raw",
-        "V_raw",
-        "S_raw",
-        "A_raw",
-        "sigma_raw",
-        "tau_raw",
-        "CAL_raw",
-        "SRM_raw",
-        "PEER_raw",
-        "ETFF_raw",
-        "VIX_raw",
-        "TREND_raw",
-    ]
     core_in = [c for c in CORE_ORDER if c in norm_cols]
-    rest = [c for c in norm_cols if c not in CORE_ORDER]
+    rest = [c for c in norm_cols if c not in CORE_SET]
     norm_cols = core_in + sorted(rest)
 
     factors_df = robust_normalize_df(
@@ -388,7 +408,8 @@ def main():
     )
 
     # rename *_raw_norm -> *_norm
-    rename_map = {c + "_norm": c.replace("_raw", "") + "_norm" for c in norm_cols}
+    rename_map = dict(CORE_RENAME)
+    rename_map.update({c + "_norm": c.replace("_raw", "") + "_norm" for c in rest})
     factors_df.rename(columns=rename_map, inplace=True)
 
     # 4) Score
@@ -420,13 +441,22 @@ def main():
     pulls_path = os.path.join(out_dir, f"{rid}_pulls.csv")
     tele_path = os.path.join(out_dir, f"{rid}_telemetry.csv")
 
-    if not dry_run:
-        write_factors(factors_path, raw_rows)
-    df_scores.to_csv(scores_path, index=False)
-    df_trades.to_csv(trades_path, index=False)
-    if not dry_run:
-        write_pulls(pulls_path, get_pull_log())
-        write_telemetry(tele_path, reg.stats())
+    if dry_run:
+        df_scores.to_csv(scores_path, index=False)
+        df_trades.to_csv(trades_path, index=False)
+    else:
+        # independent files: overlap formatting with write-out
+        writes = [
+            partial(write_factors, factors_path, raw_rows),
+            partial(df_scores.to_csv, scores_path, index=False),
+            partial(df_trades.to_csv, trades_path, index=False),
+            partial(write_pulls, pulls_path, get_pull_log()),
+            partial(write_telemetry, tele_path, reg.stats()),
+        ]
+        with ThreadPoolExecutor(max_workers=len(writes)) as ex:
+            for fut in [ex.submit(w) for w in writes]:
+                fut.result()
+        # reads the scores/factors files written above
         finalize_results(scores_path, out_dir)
 
     print(
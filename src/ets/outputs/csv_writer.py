@@ -1,15 +1,63 @@
+import csv
 import os
 import pandas as pd
 
+_BUFSIZE = 1 << 20
+_CHUNK_ROWS = 10_000
+
+# Parquet siblings when pyarrow is available. CSVs always go through pandas:
+# pyarrow's CSV writer quotes headers/strings and formats 0.0 as 0, so its
+# output would not match the published files byte for byte.
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:
+    pa = None
+
 
 def write_csv(df: pd.DataFrame, path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    df.to_csv(path, index=False)
+    # large write buffer; chunksize streams rows instead of formatting all at once
+    with open(path, "w", newline="", encoding="utf-8", buffering=_BUFSIZE) as f:
+        df.to_csv(f, index=False, chunksize=_CHUNK_ROWS)
+
+
+def rows_to_columns(rows: list) -> dict:
+    """
+    List of row dicts -> dict of column lists (column union in first-seen order,
+    as pd.DataFrame(rows) would build; missing cells are None).
+    """
+    cols = dict.fromkeys(k for r in rows for k in r)
+    return {k: [r.get(k) for r in rows] for k in cols}
+
+
+def _write_rows(path: str, rows: list):
+    write_csv(pd.DataFrame(rows), path)
+
+
+def write_parquet(path: str, rows: list) -> bool:
+    """Columnar copy of rows (exact floats, fast re-read); False without pyarrow."""
+    if pa is None:
+        return False
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pq.write_table(pa.table(rows_to_columns(rows)), path)
+        return True
+    except Exception:
+        return False
 
 
 def write_factors(path: str, rows: list):
-    df = pd.DataFrame(rows)
-    write_csv(df, path)
+    _write_rows(path, rows)
+    # parquet sibling for finalize_results; the CSV stays the public artifact.
+    # run ids repeat (date_session), so never leave an older sibling behind
+    if path.endswith(".csv"):
+        pq_path = path[: -len(".csv")] + ".parquet"
+        if not write_parquet(pq_path, rows):
+            try:
+                os.remove(pq_path)
+            except OSError:
+                pass
 
 
 def write_scores(path: str, df_scores: pd.DataFrame):
@@ -20,6 +68,16 @@ def write_trades(path: str, df_trades: pd.DataFrame):
     write_csv(df_trades, path)
 
 
+def write_dict_rows(path: str, rows: list):
+    """Small list-of-dicts -> CSV with the stdlib writer (no DataFrame)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fields = list(dict.fromkeys(k for r in rows for k in r))
+    with open(path, "w", newline="", encoding="utf-8", buffering=_BUFSIZE) as f:
+        w = csv.DictWriter(f, fieldnames=fields, lineterminator="\n")
+        w.writeheader()
+        w.writerows(rows)
+
+
 def write_pulls(path: str, rows: list):
-    df = pd.DataFrame(rows)
-    write_csv(df, path)
+    # flat provider/latency log: no NaNs to format, so pandas adds nothing
+    write_dict_rows(path, rows)
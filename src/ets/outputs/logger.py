@@ -1,21 +1,36 @@
 import logging
 import os
+import threading
 from datetime import datetime
 
+_FMT = logging.Formatter(
+    "%(asctime)s %(levelname)s | %(name)s | %(message)s", "%Y-%m-%d %H:%M:%S"
+)
+# logs_dir -> (file handler, stream handler), shared by every named logger
+_HANDLERS: dict = {}
+_LOCK = threading.Lock()
+
+
+def _handlers(logs_dir: str):
+    with _LOCK:
+        pair = _HANDLERS.get(logs_dir)
+        if pair is None:
+            os.makedirs(logs_dir, exist_ok=True)
+            log_path = os.path.join(
+                logs_dir, f"{datetime.utcnow().strftime('%Y%m%d')}.log"
+            )
+            fh = logging.FileHandler(log_path)
+            ch = logging.StreamHandler()
+            fh.setFormatter(_FMT)
+            ch.setFormatter(_FMT)
+            pair = _HANDLERS[logs_dir] = (fh, ch)
+        return pair
+
 
 def get_logger(name: str, logs_dir: str = "logs"):
-    os.makedirs(logs_dir, exist_ok=True)
-    log_path = os.path.join(logs_dir, f"{datetime.utcnow().strftime('%Y%m%d')}.log")
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     if not logger.handlers:
-        fh = logging.FileHandler(log_path)
-        ch = logging.StreamHandler()
-        fmt = logging.Formatter(
-            "%(asctime)s %(levelname)s | %(name)s | %(message)s", "%Y-%m-%d %H:%M:%S"
-        )
-        fh.setFormatter(fmt)
-        ch.setFormatter(fmt)
-        logger.addHandler(fh)
-        logger.addHandler(ch)
+        for h in _handlers(logs_dir):
+            logger.addHandler(h)
     return logger
@@ -1,8 +1,5 @@
-import os
-import pandas as pd
+from ets.outputs.csv_writer import write_dict_rows
 
 
 def write_telemetry(path: str, provider_stats: list[dict]):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    df = pd.DataFrame(provider_stats)
-    df.to_csv(path, index=False)
+    write_dict_rows(path, provider_stats)
@@ -6,23 +6,43 @@ import pandas as pd
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
 )
 
 
-def compute_a_raw(close: pd.Series) -> float:
-    c = close.dropna().astype(float)
-    if len(c) < 3:
+def compute_a_raw(close) -> float:
+    # plain ndarray; only the last 3 valid closes matter:
+    # r_last - r_prev = log(c2) - 2*log(c1) + log(c0)
+    c = np.asarray(close, dtype=np.float64)
+    c = c[~np.isnan(c)]
+    if c.size < 3:
         return 0.0
-    r = np.log(c / c.shift(1))
-    a = r.iloc[-1] - r.iloc[-2]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lg = np.log(c[-3:])
+    a = lg[2] - 2.0 * lg[1] + lg[0]
     if np.isfinite(a):
         return float(a)
     return 0.0
 
 
+def compute_a_raw_batch(closes: Dict[str, pd.Series]) -> Dict[str, float]:
+    """compute_a_raw for many symbols: last 3 valid closes stacked, one log/diff pass."""
+    syms = list(closes)
+    last3 = np.full((len(syms), 3), np.nan)
+    for i, s in enumerate(syms):
+        c = closes[s].dropna().to_numpy(dtype=np.float64)[-3:]
+        if len(c) == 3:
+            last3[i] = c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.diff(np.log(last3), axis=1)
+    a = r[:, 1] - r[:, 0]
+    a[~np.isfinite(a)] = 0.0
+    return dict(zip(syms, a.tolist()))
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Build A_raw (acceleration) into out/factors_latest.csv"
@@ -35,7 +55,7 @@ def main():
     cached, misses = {}, []
     for s in symbols:
         c = load_daily_cache(s)
-        if c is not None and len(c) >= 3:
+        if is_fresh(c, 3):
             cached[s] = c
         else:
             misses.append(s)
@@ -47,13 +67,14 @@ def main():
             if df is not None and not df.empty:
                 save_daily_cache(s, df)
 
-    vals: Dict[str, float] = {}
-    for s in symbols:
-        df = cached.get(s) or fetched.get(s)
-        if df is None or df.empty:
-            vals[s] = 0.0
-            continue
-        vals[s] = compute_a_raw(df["Close"])
+    frames = {**fetched, **cached}
+    closes = {
+        s: frames[s]["Close"]
+        for s in symbols
+        if frames.get(s) is not None and not frames[s].empty
+    }
+    vals: Dict[str, float] = {s: 0.0 for s in symbols}
+    vals.update(compute_a_raw_batch(closes))
 
     update_factors_csv(symbols, "A_raw", vals)
     print("[DONE] A_raw complete")
@@ -1,22 +1,25 @@
 from __future__ import annotations
 import argparse
-import sys
-import math
 import csv
+import random
+import time
 import datetime as dt
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+import numpy as np
+
 from ets.factors.cache_utils import read_symbols, update_factors_csv
+from ets.data.providers.http import pooled_session
 from ets.data.providers.provider_registry import ProviderRegistry
 
-try:
-    import requests
-except Exception:
-    print("[FATAL] requests required", file=sys.stderr)
-    raise
-
 CACHE_FILE = Path("out/cache/calendar.csv")
+_CACHE_FIELDS = ["symbol", "kind", "date", "checked_at"]
+_STALE_AFTER = dt.timedelta(hours=24)
+# keep-alive fallback when the registry carries no session
+_SESSION = pooled_session()
+_ATTEMPTS = 4  # calendar GETs; 429/5xx are retried with backoff
 
 
 def _load_cfg():
@@ -37,79 +40,94 @@ def _load_cfg():
     raise FileNotFoundError("config.yaml not found")
 
 
-def _load_calendar_cache() -> Dict[Tuple[str, str], str]:
-    # key: (symbol, "next"), value: YYYY-MM-DD
-    out: Dict[Tuple[str, str], str] = {}
+def _load_calendar_cache() -> Dict[Tuple[str, str], Dict[str, str]]:
+    # key: (symbol, "next"), value: the CSV row (date YYYY-MM-DD, checked_at)
+    out: Dict[Tuple[str, str], Dict[str, str]] = {}
     if not CACHE_FILE.exists():
         return out
     with CACHE_FILE.open() as f:
-        r = csv.DictReader(f)
-        for row in r:
-            out[(row["symbol"].upper(), row["kind"])] = row["date"]
+        for row in csv.DictReader(f):
+            out[(row["symbol"].upper(), row["kind"])] = row
     return out
 
 
-def _save_calendar_cache(rows: List[Dict[str, str]]) -> None:
+def _save_calendar_cache(cache: Dict[Tuple[str, str], Dict[str, str]]) -> None:
+    # the in-memory dict is authoritative: one write, no re-read/merge
     CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    # de-dup by (symbol,kind)
-    dedup: Dict[Tuple[str, str], Dict[str, str]] = {}
-    if CACHE_FILE.exists():
-        with CACHE_FILE.open() as f:
-            for row in csv.DictReader(f):
-                dedup[(row["symbol"].upper(), row["kind"])] = row
-    for r in rows:
-        dedup[(r["symbol"].upper(), r["kind"])] = r
-    with CACHE_FILE.open("w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=["symbol", "kind", "date", "checked_at"])
+    tmp = CACHE_FILE.with_suffix(".csv.tmp")
+    with tmp.open("w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=_CACHE_FIELDS, extrasaction="ignore")
         w.writeheader()
-        for r in dedup.values():
-            w.writerow(r)
+        w.writerows(cache.values())
+    tmp.replace(CACHE_FILE)
 
 
-def _days_until(d: str) -> int:
-    # d: "YYYY-MM-DD"
-    today = dt.date.today()
+def _is_stale(row: Dict[str, str], now: dt.datetime, today: dt.date) -> bool:
+    """Event day reached (or passed) and last checked over _STALE_AFTER ago."""
+    if _days_until(row.get("date") or "", today) > 0:
+        return False
     try:
-        target = dt.datetime.strptime(d, "%Y-%m-%d").date()
-    except Exception:
+        checked = dt.datetime.fromisoformat((row.get("checked_at") or "").rstrip("Z"))
+        checked = checked.replace(tzinfo=dt.timezone.utc)
+    except ValueError:
+        return True
+    return now - checked > _STALE_AFTER
+
+
+@lru_cache(maxsize=8192)
+def _days_until(d: str, today: dt.date) -> int:
+    # d: "YYYY-MM-DD"; many symbols share a date, and main() fixes today per run
+    try:
+        target = dt.date.fromisoformat(d)
+    except (TypeError, ValueError):
         return 9999
     return max(0, (target - today).days)
 
 
-def _fetch_next_earnings(reg: dict, symbol: str, horizon_days: int = 60) -> str | None:
-    """Call Finnhub calendar within [today, today+horizon], return earliest date for symbol."""
+def _retry_delay(r, attempt: int) -> float:
+    # server hint first (seconds form), else exponential backoff with jitter
+    try:
+        return min(60.0, max(0.0, float(r.headers.get("Retry-After", ""))))
+    except ValueError:
+        return 2**attempt * 0.5 + random.random()
+
+
+def _fetch_all_earnings(
+    reg: dict, today: dt.date, horizon_days: int = 60
+) -> Dict[str, str]:
+    """
+    One Finnhub calendar call for [today, today+horizon] (no symbol filter);
+    returns the earliest date per symbol.
+    """
     base = reg.get("base")
     key = reg.get("key")
     if not key:
-        return None
-    today = dt.date.today()
+        return {}
     to = today + dt.timedelta(days=horizon_days)
     url = f"{base}/calendar/earnings"
-    params = {
-        "from": today.isoformat(),
-        "to": to.isoformat(),
-        "symbol": symbol,
-        "token": key,
-    }
+    params = {"from": today.isoformat(), "to": to.isoformat(), "token": key}
     sess = reg.get("session")
-    if reg.get("limiter"):
-        reg["limiter"].acquire(cost=1)
+    by_sym: Dict[str, str] = {}
     try:
-        r = (sess or requests).get(url, params=params, timeout=8)
+        for attempt in range(_ATTEMPTS):
+            if reg.get("limiter"):
+                reg["limiter"].acquire(cost=1)
+            r = (sess or _SESSION).get(url, params=params, timeout=15)
+            if r.status_code != 429 and r.status_code < 500:
+                break
+            if attempt < _ATTEMPTS - 1:
+                time.sleep(_retry_delay(r, attempt))
         if r.status_code != 200:
-            return None
+            return {}
         js = r.json() or {}
-        eps = js.get("earningsCalendar") or []
-        dates = sorted(
-            [
-                row.get("date")
-                for row in eps
-                if (row.get("symbol") or "").upper() == symbol and row.get("date")
-            ]
-        )
-        return dates[0] if dates else None
+        for row in js.get("earningsCalendar") or []:
+            sym = (row.get("symbol") or "").upper()
+            d = row.get("date")
+            if sym and d and (sym not in by_sym or d < by_sym[sym]):
+                by_sym[sym] = d
     except Exception:
-        return None
+        return {}
+    return by_sym
 
 
 def main():
@@ -128,43 +146,47 @@ def main():
     reg = ProviderRegistry(cfg).finnhub  # uses your .env key & limiter
     cache = _load_calendar_cache()
 
-    updates_cache: List[Dict[str, str]] = []
-    cal_vals: Dict[str, float] = {}
+    now = dt.datetime.now(dt.timezone.utc)
+    today = dt.date.today()  # one date for the whole run
+    checked_at = now.isoformat(timespec="seconds").replace("+00:00", "Z")
+    stale = [k for k, row in cache.items() if _is_stale(row, now, today)]
+    for k in stale:
+        del cache[k]  # refetched below
+    dirty = bool(stale)
+
+    dates: Dict[str, str | None] = {}
+    by_sym: Dict[str, str] = {}
+    if any((s.upper(), "next") not in cache for s in symbols):
+        by_sym = _fetch_all_earnings(reg, today, horizon_days=args.horizon)
     for s in symbols:
         sU = s.upper()
-        cached = cache.get((sU, "next"))
-        if cached is None:
-            nxt = _fetch_next_earnings(reg, sU, horizon_days=args.horizon)
+        row = cache.get((sU, "next"))
+        if row is None:
+            nxt = by_sym.get(sU)
             if nxt:
-                updates_cache.append(
-                    {
-                        "symbol": sU,
-                        "kind": "next",
-                        "date": nxt,
-                        "checked_at": dt.datetime.utcnow().isoformat() + "Z",
-                    }
-                )
-                d = _days_until(nxt)
-                cal_vals[sU] = float(math.exp(-max(0, d) / max(1, args.decay_k)))
-            else:
-                cal_vals[sU] = 0.0
+                cache[(sU, "next")] = {
+                    "symbol": sU,
+                    "kind": "next",
+                    "date": nxt,
+                    "checked_at": checked_at,
+                }
+                dirty = True
+            dates[sU] = nxt
         else:
-            d = _days_until(cached)
-            # Optional: refresh cache if stale (>24h) and event not passed
-            if (
-                d > 0
-                and dt.datetime.fromisoformat(
-                    updates_cache[-1]["checked_at"][:-1]
-                ).date()
-                if updates_cache
-                else True
-            ):
-                # keep cached for now; lightweight
-                pass
-            cal_vals[sU] = float(math.exp(-max(0, d) / max(1, args.decay_k)))
-
-    if updates_cache:
-        _save_calendar_cache(updates_cache)
+            dates[sU] = row["date"]
+
+    if dirty:
+        _save_calendar_cache(cache)
+
+    # exp(-days/k) in one ufunc call; no known date -> 0.0
+    syms = list(dates)
+    days = np.array(
+        [np.nan if d is None else _days_until(d, today) for d in dates.values()],
+        dtype=np.float64,
+    )
+    vals = np.exp(-days / max(1, args.decay_k))
+    vals[np.isnan(days)] = 0.0
+    cal_vals: Dict[str, float] = dict(zip(syms, vals.tolist()))
 
     update_factors_csv(symbols, "CAL_raw", cal_vals)
     print("[DONE] CAL_raw complete")
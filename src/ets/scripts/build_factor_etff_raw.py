@@ -2,23 +2,19 @@ from __future__ import annotations
 import argparse
 from typing import List, Dict
 import numpy as np
-import pandas as pd
 
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
 )
+from ets.factors.returns import log_rets_np, corr_rows
 from ets.factors.sector_utils import load_sector_profile, load_sector_etf_map
 
 
-def log_rets(close: pd.Series) -> pd.Series:
-    c = close.dropna().astype(float)
-    return np.log(c / c.shift(1))
-
-
 def main():
     ap = argparse.ArgumentParser(
         description="Build ETFF_raw (corr of stock returns with sector ETF dollar volume over 20d)"
@@ -46,7 +42,7 @@ def main():
     cached, miss = {}, []
     for s in symbols:
         c = load_daily_cache(s)
-        if c is not None and len(c) > args.window:
+        if is_fresh(c, args.window + 1):
             cached[s] = c
         else:
             miss.append(s)
@@ -62,7 +58,7 @@ def main():
     etf_cached, etf_miss = {}, []
     for e in etfs_needed:
         c = load_daily_cache(e)
-        if c is not None and len(c) > args.window:
+        if is_fresh(c, args.window + 1):
             etf_cached[e] = c
         else:
             etf_miss.append(e)
@@ -76,33 +72,30 @@ def main():
                 save_daily_cache(e, df)
                 etf_cached[e] = df
 
-    vals: Dict[str, float] = {}
+    # ETF dollar volume once per ETF, then one corr_rows call per ETF
+    dv_by_etf = {
+        e: (df["Close"].astype(float) * df["Volume"].astype(float))
+        .dropna()
+        .tail(args.window)
+        .to_numpy()
+        for e, df in etf_cached.items()
+        if df is not None and not df.empty
+    }
+    groups: Dict[str, Dict[str, np.ndarray]] = {}
     for s in symbols:
-        sec = sym_to_sector.get(s, "Unknown")
-        etf = etf_map.get(sec)
-        if not etf or etf not in etf_cached:
-            vals[s] = 0.0
-            continue
+        etf = etf_map.get(sym_to_sector.get(s, "Unknown"))
+        dv = dv_by_etf.get(etf)
         df_s = cached.get(s)
-        df_e = etf_cached.get(etf)
-        if df_s is None or df_s.empty or df_e is None or df_e.empty:
-            vals[s] = 0.0
+        if dv is None or df_s is None or df_s.empty:
             continue
+        r_s = log_rets_np(df_s["Close"], args.window)
+        if len(r_s) == len(dv):
+            groups.setdefault(etf, {})[s] = r_s
 
-        r_s = log_rets(df_s["Close"]).tail(args.window)
-        # ETF dollar volume
-        dv = (
-            (df_e["Close"].astype(float) * df_e["Volume"].astype(float))
-            .dropna()
-            .tail(args.window)
-        )
-        if len(r_s) != len(dv) or r_s.isna().all() or dv.isna().all():
-            vals[s] = 0.0
-            continue
-        corr = r_s.reset_index(drop=True).corr(
-            dv.reset_index(drop=True), method="pearson"
-        )
-        vals[s] = float(0.0 if np.isnan(corr) else corr)
+    vals: Dict[str, float] = {s: 0.0 for s in symbols}
+    for etf, rets in groups.items():
+        c = corr_rows(np.vstack(list(rets.values())), dv_by_etf[etf])
+        vals.update(zip(rets, c.tolist()))
 
     update_factors_csv(symbols, "ETFF_raw", vals)
     print("[DONE] ETFF_raw complete")
@@ -1,17 +1,11 @@
 from __future__ import annotations
 import argparse
-import sys
 from pathlib import Path
 from typing import List
 import numpy as np
 import pandas as pd
 
-# Free data
-try:
-    import yfinance as yf
-except Exception:
-    print("[FATAL] yfinance is required (pip install yfinance)", file=sys.stderr)
-    raise
+from ets.factors.cache_utils import fetch_daily_batch, is_fresh, update_factors_csv
 
 CACHE_DIR = Path("out/cache/daily")
 OUT_DIR = Path("out")
@@ -61,35 +55,9 @@ def save_cache(symbol: str, df: pd.DataFrame) -> None:
 def fetch_daily(symbols: List[str], lookback_days: int) -> dict[str, pd.DataFrame]:
     """
     Batch-download daily bars; return dict[symbol]->DataFrame(Date index, columns: Open, High, Low, Close, Volume).
+    One threaded multi-ticker request; empty symbols are retried individually.
     """
-    if not symbols:
-        return {}
-    df = yf.download(
-        symbols,
-        period=f"{max(lookback_days, 30)}d",
-        interval="1d",
-        progress=False,
-        threads=False,
-        group_by="ticker",
-        auto_adjust=False,
-    )
-
-    out: dict[str, pd.DataFrame] = {}
-    if isinstance(df.columns, pd.MultiIndex):
-        for sym in symbols:
-            sub = df.get(sym)
-            if sub is None or sub.empty:
-                continue
-            sub = sub[["Open", "High", "Low", "Close", "Volume"]].copy()
-            sub.index = pd.to_datetime(sub.index)
-            out[sym] = sub
-    else:
-        # Single symbol case
-        sub = df[["Open", "High", "Low", "Close", "Volume"]].copy()
-        sub.index = pd.to_datetime(sub.index)
-        out[symbols[0]] = sub
-
-    return out
+    return fetch_daily_batch(symbols, lookback_days)
 
 
 def compute_m_raw(close: pd.Series, window: int = 10) -> float:
@@ -107,29 +75,21 @@ def compute_m_raw(close: pd.Series, window: int = 10) -> float:
     return float(np.log(c_t / c_w))
 
 
-def update_factors_csv(symbols: List[str], m_values: dict[str, float]) -> None:
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    if FACTORS_CSV.exists():
-        df = pd.read_csv(FACTORS_CSV)
-    else:
-        df = pd.DataFrame({"symbol": symbols})
-    # ensure symbol column normalized
-    df["symbol"] = df["symbol"].astype(str).str.upper()
-    # left-join M_raw
-    upd = pd.DataFrame(
-        {"symbol": list(m_values.keys()), "M_raw": list(m_values.values())}
-    )
-    df = df.merge(upd, on="symbol", how="left")
-    # if M_raw arrived as _x/_y due to existing column, resolve to new values
-    if "M_raw_x" in df.columns and "M_raw_y" in df.columns:
-        df["M_raw"] = df["M_raw_y"].fillna(df["M_raw_x"])
-        df = df.drop(columns=["M_raw_x", "M_raw_y"])
-    # ensure M_raw exists
-    if "M_raw" not in df.columns:
-        df["M_raw"] = 0.0
-    # write back
-    df.to_csv(FACTORS_CSV, index=False)
-    print(f"[OK] wrote {FACTORS_CSV} | rows={len(df)}")
+def compute_m_raw_batch(
+    closes: dict[str, pd.Series], window: int = 10
+) -> dict[str, float]:
+    """compute_m_raw for many symbols: (C_t, C_{t-window}) pairs stacked, one log pass."""
+    syms = list(closes)
+    ends = np.full((len(syms), 2), np.nan)
+    for i, s in enumerate(syms):
+        c = closes[s].dropna().to_numpy(dtype=np.float64)
+        if len(c) > window:
+            ends[i] = c[-(window + 1)], c[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = np.log(ends[:, 1] / ends[:, 0])
+    # short history, non-positive prices -> 0.0 (as compute_m_raw)
+    m[~((ends > 0).all(axis=1) & np.isfinite(m))] = 0.0
+    return dict(zip(syms, m.tolist()))
 
 
 def main():
@@ -155,7 +115,7 @@ def main():
     misses: list[str] = []
     for s in symbols:
         c = load_cached(s)
-        if c is not None and (len(c) >= args.window + 1):
+        if is_fresh(c, args.window + 1):
             cached[s] = c
         else:
             misses.append(s)
@@ -169,16 +129,16 @@ def main():
             if df is not None and not df.empty:
                 save_cache(s, df)
 
-    m_vals: dict[str, float] = {}
-    for s in symbols:
-        df = cached.get(s) or fetched.get(s)
-        if df is None or df.empty:
-            m_vals[s] = 0.0
-            continue
-        close = df["Close"].astype(float)
-        m_vals[s] = compute_m_raw(close, window=args.window)
-
-    update_factors_csv(symbols, m_vals)
+    frames = {**fetched, **cached}
+    closes = {
+        s: frames[s]["Close"]
+        for s in symbols
+        if frames.get(s) is not None and not frames[s].empty
+    }
+    m_vals: dict[str, float] = {s: 0.0 for s in symbols}
+    m_vals.update(compute_m_raw_batch(closes, window=args.window))
+
+    update_factors_csv(symbols, "M_raw", m_vals)
     print("[DONE] M_raw complete")
 
 
@@ -1,22 +1,29 @@
 from __future__ import annotations
 import argparse
+import warnings
 from typing import List, Dict
 import numpy as np
-import pandas as pd
 
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
 )
+from ets.factors.returns import log_rets_np, corr_rows
 from ets.factors.sector_utils import load_sector_profile
 
 
-def log_rets(close: pd.Series) -> pd.Series:
-    c = close.dropna().astype(float)
-    return np.log(c / c.shift(1))
+def _front_aligned(rows: List[np.ndarray], width: int | None = None) -> np.ndarray:
+    """Stack rows position-aligned from the front, NaN-padded/truncated to width."""
+    if width is None:
+        width = max(map(len, rows))
+    M = np.full((len(rows), width), np.nan)
+    for i, r in enumerate(rows):
+        M[i, : min(len(r), width)] = r[:width]
+    return M
 
 
 def main():
@@ -55,7 +62,7 @@ def main():
     cached, miss = {}, []
     for s in all_syms:
         c = load_daily_cache(s)
-        if c is not None and len(c) > args.window:
+        if is_fresh(c, args.window + 1):
             cached[s] = c
         else:
             miss.append(s)
@@ -67,31 +74,31 @@ def main():
                 save_daily_cache(s, df)
                 cached[s] = df
 
-    vals: Dict[str, float] = {}
+    rets: Dict[str, np.ndarray] = {}
+
+    def _rets(sym: str) -> np.ndarray:
+        if sym not in rets:
+            rets[sym] = log_rets_np(cached[sym]["Close"], args.window)
+        return rets[sym]
+
+    # a sector's targets share the same peer list (bar the target itself):
+    # group targets by peer set, then one median + one corr_rows per group
+    groups: Dict[tuple, List[str]] = {}
     for s in symbols:
         sec = sym_to_sector.get(s, "Unknown")
         peers = [p for p in sector_peers.get(sec, []) if p != s][: args.max_peers]
-        if len(peers) < 2:
-            vals[s] = 0.0
-            continue
-        r_s = log_rets(cached[s]["Close"]).tail(args.window)
-        # build peer median returns series (aligned)
-        peer_mat = []
-        for p in peers:
-            if p not in cached:
-                continue
-            rr = log_rets(cached[p]["Close"]).tail(args.window)
-            peer_mat.append(rr.reset_index(drop=True))
-        if len(peer_mat) < 2:
-            vals[s] = 0.0
-            continue
-        peer_df = pd.concat(peer_mat, axis=1)
-        med = peer_df.median(axis=1)
-        if r_s.isna().all() or med.isna().all():
-            vals[s] = 0.0
-            continue
-        corr = r_s.reset_index(drop=True).corr(med, method="pearson")
-        vals[s] = float(0.0 if np.isnan(corr) else corr)
+        key = tuple(p for p in peers if p in cached)
+        if len(key) >= 2:
+            groups.setdefault(key, []).append(s)
+
+    vals: Dict[str, float] = {s: 0.0 for s in symbols}
+    for key, targets in groups.items():
+        P = _front_aligned([_rets(p) for p in key])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+            med = np.nanmedian(P, axis=0)
+        R = _front_aligned([_rets(s) for s in targets], width=len(med))
+        vals.update(zip(targets, corr_rows(R, med).tolist()))
 
     update_factors_csv(symbols, "PEER_raw", vals)
     print("[DONE] PEER_raw complete")
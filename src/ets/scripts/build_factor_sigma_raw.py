@@ -6,23 +6,40 @@ import pandas as pd
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
 )
+from ets.factors.returns import log_rets_np
 
 
 def compute_sigma_raw(close: pd.Series, window: int = 10) -> float:
     c = close.dropna().astype(float)
     if len(c) <= window:
         return 0.0
-    r = np.log(c / c.shift(1)).dropna()
-    s = float(r.tail(window).std(ddof=0))
+    s = float(log_rets_np(c, window).std())
     if np.isfinite(s):
         return s
     return 0.0
 
 
+def compute_sigma_raw_batch(
+    closes: Dict[str, pd.Series], window: int = 10
+) -> Dict[str, float]:
+    """compute_sigma_raw for many symbols: last window+1 closes stacked, one log/std pass."""
+    syms = list(closes)
+    M = np.full((len(syms), window + 1), np.nan)
+    for i, s in enumerate(syms):
+        c = closes[s].dropna().to_numpy(dtype=np.float64)
+        if len(c) > window:
+            M[i] = c[-(window + 1) :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sig = np.diff(np.log(M), axis=1).std(axis=1)
+    sig[~np.isfinite(sig)] = 0.0
+    return dict(zip(syms, sig.tolist()))
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Build sigma_raw (realized vol) into out/factors_latest.csv"
@@ -36,7 +53,7 @@ def main():
     cached, misses = {}, []
     for s in symbols:
         c = load_daily_cache(s)
-        if c is not None and len(c) > args.window:
+        if is_fresh(c, args.window + 1):
             cached[s] = c
         else:
             misses.append(s)
@@ -48,13 +65,14 @@ def main():
             if df is not None and not df.empty:
                 save_daily_cache(s, df)
 
-    vals: Dict[str, float] = {}
-    for s in symbols:
-        df = cached.get(s) or fetched.get(s)
-        if df is None or df.empty:
-            vals[s] = 0.0
-            continue
-        vals[s] = compute_sigma_raw(df["Close"], window=args.window)
+    frames = {**fetched, **cached}
+    closes = {
+        s: frames[s]["Close"]
+        for s in symbols
+        if frames.get(s) is not None and not frames[s].empty
+    }
+    vals: Dict[str, float] = {s: 0.0 for s in symbols}
+    vals.update(compute_sigma_raw_batch(closes, window=args.window))
 
     update_factors_csv(symbols, "sigma_raw", vals)
     print("[DONE] sigma_raw complete")
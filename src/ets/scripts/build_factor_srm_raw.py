@@ -7,6 +7,7 @@ import pandas as pd
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
@@ -21,6 +22,17 @@ def log_return(close: pd.Series, window: int) -> float:
     return float(np.log(c.iloc[-1] / c.iloc[-(window + 1)]))
 
 
+def log_return_batch(closes: List[pd.Series], window: int) -> np.ndarray:
+    """log_return for many series: (C_{t-window}, C_t) pairs stacked, one log pass."""
+    ends = np.ones((len(closes), 2))  # short history -> log(1/1) = 0.0
+    for i, close in enumerate(closes):
+        c = close.dropna().to_numpy(dtype=np.float64)
+        if len(c) > window:
+            ends[i] = c[-(window + 1)], c[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(ends[:, 1] / ends[:, 0])
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Build SRM_raw (sector-relative momentum: 10d stock r - sector ETF r)"
@@ -49,7 +61,7 @@ def main():
     cached, misses = {}, []
     for s in symbols:
         c = load_daily_cache(s)
-        if c is not None and len(c) > args.window:
+        if is_fresh(c, args.window + 1):
             cached[s] = c
         else:
             misses.append(s)
@@ -65,7 +77,7 @@ def main():
     etf_cached, etf_miss = {}, []
     for e in etfs_needed:
         c = load_daily_cache(e)  # reuse same cache namespace
-        if c is not None and len(c) > args.window:
+        if is_fresh(c, args.window + 1):
             etf_cached[e] = c
         else:
             etf_miss.append(e)
@@ -79,24 +91,23 @@ def main():
                 save_daily_cache(e, df)
                 etf_cached[e] = df
 
-    vals: Dict[str, float] = {}
-    for s in symbols:
-        df = cached.get(s) or fetched.get(s)
-        if df is None or df.empty:
-            vals[s] = 0.0
-            continue
-        sector = sym_to_sector.get(s, "Unknown")
-        etf = m.get(sector)
-        if not etf:
-            vals[s] = 0.0
-            continue
-        edf = etf_cached.get(etf)
-        if edf is None or edf.empty:
-            vals[s] = 0.0
-            continue
-        r_sym = log_return(df["Close"], args.window)
-        r_etf = log_return(edf["Close"], args.window)
-        vals[s] = float(r_sym - r_etf)
+    # one log pass for the ETFs, one for the stocks, then a vector difference
+    etfs = [e for e, edf in etf_cached.items() if edf is not None and not edf.empty]
+    etf_r = dict(
+        zip(etfs, log_return_batch([etf_cached[e]["Close"] for e in etfs], args.window))
+    )
+    frames = {**fetched, **cached}
+    have = [
+        s
+        for s in symbols
+        if frames.get(s) is not None
+        and not frames[s].empty
+        and m.get(sym_to_sector.get(s, "Unknown")) in etf_r
+    ]
+    r_sym = log_return_batch([frames[s]["Close"] for s in have], args.window)
+    r_etf = np.array([etf_r[m[sym_to_sector.get(s, "Unknown")]] for s in have])
+    vals: Dict[str, float] = {s: 0.0 for s in symbols}
+    vals.update(zip(have, (r_sym - r_etf).tolist()))
 
     update_factors_csv(symbols, "SRM_raw", vals)
     print("[DONE] SRM_raw complete")
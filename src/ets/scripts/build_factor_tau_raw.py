@@ -6,6 +6,7 @@ import pandas as pd
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
@@ -27,6 +28,23 @@ def compute_tau_raw(close: pd.Series, window: int = 20) -> float:
     return 0.0
 
 
+def compute_tau_raw_batch(
+    closes: Dict[str, pd.Series], window: int = 20
+) -> Dict[str, float]:
+    """compute_tau_raw for many symbols: last `window` closes stacked, one mean/std pass."""
+    syms = list(closes)
+    X = np.full((len(syms), window), np.nan)
+    for i, s in enumerate(syms):
+        c = closes[s].dropna().to_numpy(dtype=np.float64)
+        if len(c) >= window:
+            X[i] = c[-window:]
+    sma = X.mean(axis=1)
+    std = X.std(axis=1)
+    tau = -(X[:, -1] - sma) / np.maximum(std, 1e-9)
+    tau[~np.isfinite(tau)] = 0.0  # short history -> 0.0
+    return dict(zip(syms, tau.tolist()))
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Build tau_raw (mean reversion stretch) into out/factors_latest.csv"
@@ -40,7 +58,7 @@ def main():
     cached, misses = {}, []
     for s in symbols:
         c = load_daily_cache(s)
-        if c is not None and len(c) >= args.window:
+        if is_fresh(c, args.window):
             cached[s] = c
         else:
             misses.append(s)
@@ -52,13 +70,14 @@ def main():
             if df is not None and not df.empty:
                 save_daily_cache(s, df)
 
-    vals: Dict[str, float] = {}
-    for s in symbols:
-        df = cached.get(s) or fetched.get(s)
-        if df is None or df.empty:
-            vals[s] = 0.0
-            continue
-        vals[s] = compute_tau_raw(df["Close"], window=args.window)
+    frames = {**fetched, **cached}
+    closes = {
+        s: frames[s]["Close"]
+        for s in symbols
+        if frames.get(s) is not None and not frames[s].empty
+    }
+    vals: Dict[str, float] = {s: 0.0 for s in symbols}
+    vals.update(compute_tau_raw_batch(closes, window=args.window))
 
     update_factors_csv(symbols, "tau_raw", vals)
     print("[DONE] tau_raw complete")
@@ -1,10 +1,12 @@
 from __future__ import annotations
 import argparse
 from typing import List, Dict
+import numpy as np
 import pandas as pd
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
@@ -22,6 +24,23 @@ def compute_v_raw(volume: pd.Series, baseline_window: int = 20) -> float:
     return float((today / base) - 1.0)
 
 
+def compute_v_raw_batch(
+    volumes: Dict[str, pd.Series], baseline_window: int = 20
+) -> Dict[str, float]:
+    """compute_v_raw for many symbols: last window+1 volumes stacked, one median pass."""
+    syms = list(volumes)
+    M = np.full((len(syms), baseline_window + 1), np.nan)
+    for i, s in enumerate(syms):
+        v = volumes[s].dropna().to_numpy(dtype=np.float64)
+        if len(v) >= baseline_window + 1:
+            M[i] = v[-(baseline_window + 1) :]
+    base = np.median(M[:, :-1], axis=1)
+    ok = base > 0  # short history (NaN) or empty baseline -> 0.0
+    out = np.zeros(len(syms))
+    out[ok] = M[ok, -1] / base[ok] - 1.0
+    return dict(zip(syms, out.tolist()))
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Build V_raw (volume surge) into out/factors_latest.csv"
@@ -37,7 +56,7 @@ def main():
     cached, misses = {}, []
     for s in symbols:
         c = load_daily_cache(s)
-        if c is not None and len(c) >= args.window + 1:
+        if is_fresh(c, args.window + 1):
             cached[s] = c
         else:
             misses.append(s)
@@ -49,13 +68,16 @@ def main():
             if df is not None and not df.empty:
                 save_daily_cache(s, df)
 
-    v_vals: Dict[str, float] = {}
-    for s in symbols:
-        df = cached.get(s) or fetched.get(s)
-        if df is None or df.empty or "Volume" not in df.columns:
-            v_vals[s] = 0.0
-            continue
-        v_vals[s] = compute_v_raw(df["Volume"], baseline_window=args.window)
+    frames = {**fetched, **cached}
+    volumes = {
+        s: frames[s]["Volume"]
+        for s in symbols
+        if frames.get(s) is not None
+        and not frames[s].empty
+        and "Volume" in frames[s].columns
+    }
+    v_vals: Dict[str, float] = {s: 0.0 for s in symbols}
+    v_vals.update(compute_v_raw_batch(volumes, baseline_window=args.window))
 
     update_factors_csv(symbols, "V_raw", v_vals)
     print("[DONE] V_raw complete")
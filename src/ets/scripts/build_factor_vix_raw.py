@@ -7,21 +7,12 @@ import pandas as pd
 from ets.factors.cache_utils import (
     read_symbols,
     load_daily_cache,
+    is_fresh,
     save_daily_cache,
     fetch_daily_batch,
     update_factors_csv,
 )
-
-
-def vix_delta(series: pd.Series) -> pd.Series:
-    s = series.dropna().astype(float)
-    return s.diff()
-
-
-def series_returns(close: pd.Series) -> pd.Series:
-    c = close.dropna().astype(float)
-    r = np.log(c / c.shift(1))
-    return r
+from ets.factors.returns import log_rets_np, corr_rows
 
 
 def main():
@@ -38,7 +29,7 @@ def main():
     cached, miss = {}, []
     for s in symbols:
         c = load_daily_cache(s)
-        if c is not None and len(c) > args.window:
+        if is_fresh(c, args.window + 1):
             cached[s] = c
         else:
             miss.append(s)
@@ -53,7 +44,7 @@ def main():
     # VIX
     vx = "^VIX"
     vix_df = load_daily_cache(vx)
-    if vix_df is None or len(vix_df) <= args.window + 1:
+    if not is_fresh(vix_df, args.window + 2):
         print("[INFO] fetching ^VIX via Yahoo...")
         vfetch = fetch_daily_batch([vx], args.lookback).get(vx)
         if vfetch is not None and not vfetch.empty:
@@ -68,20 +59,33 @@ def main():
         print("[DONE] VIX_raw complete (no VIX data, zeros)")
         return
 
-    dvix = vix_delta(vix_df["Close"]).tail(args.window)
+    # ΔVIX window once; symbol returns placed on its dates (a symbol whose
+    # cache is a bar behind ^VIX must not pair with shifted deltas), then
+    # correlated in one pass over the pairwise-complete dates
+    vc = vix_df["Close"].dropna()
+    v = vc.to_numpy(dtype=np.float64)
+    # same leading-NaN slot as log_rets_np, so short histories still line up
+    dvix = np.concatenate(([np.nan], np.diff(v)))[-args.window :][: len(v)]
+    dvix_dates = pd.DatetimeIndex(vc.index[len(v) - len(dvix) :])
+    frames = {**fetched, **cached}
+    rets: Dict[str, np.ndarray] = {}
     for s in symbols:
-        df = cached.get(s) or fetched.get(s)
+        df = frames.get(s)
         if df is None or df.empty:
             vals[s] = 0.0
             continue
-        r = series_returns(df["Close"]).tail(args.window)
-        if len(r) != len(dvix) or r.isna().all() or dvix.isna().all():
+        c = df["Close"].dropna()
+        r = log_rets_np(c, args.window)
+        if len(r) != len(dvix):
             vals[s] = 0.0
             continue
-        corr = r.corr(dvix, method="pearson")
-        if np.isnan(corr):
-            corr = 0.0
-        vals[s] = float(corr)
+        pos = dvix_dates.get_indexer(pd.DatetimeIndex(c.index[len(c) - len(r) :]))
+        row = np.full(len(dvix), np.nan)
+        row[pos[pos >= 0]] = r[pos >= 0]
+        rets[s] = row
+    if rets:
+        corr = corr_rows(np.vstack(list(rets.values())), dvix)
+        vals.update(zip(rets, corr.tolist()))
 
     update_factors_csv(symbols, "VIX_raw", vals)
     print("[DONE] VIX_raw complete")
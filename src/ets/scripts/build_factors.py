@@ -1,8 +1,11 @@
 from __future__ import annotations
 import argparse
+import os
 import subprocess
 import sys
 
+from ets.factors.cache_utils import OUT_DIR, STAGE_ENV, flush_staged_factors
+
 FACTOR_TO_MODULE = {
     "M_raw": "ets.scripts.build_factor_m_raw",
     "V_raw": "ets.scripts.build_factor_v_raw",
@@ -17,6 +20,9 @@ FACTOR_TO_MODULE = {
     "ETFF_raw": "ets.scripts.build_factor_etff_raw",
     # add more mappings here as you implement them
 }
+# builders that read factors_latest.csv: staged columns are flushed first
+READS_FACTORS = {"TREND_raw"}
+STAGE_DIR = OUT_DIR / "cache" / "factor_stage"
 
 
 def main():
@@ -32,19 +38,26 @@ def main():
     args = ap.parse_args()
 
     factors = [f.strip() for f in args.factors.split(",") if f.strip()]
-    for f in factors:
-        mod = FACTOR_TO_MODULE.get(f)
-        if not mod:
-            print(f"[WARN] Unknown factor '{f}' (skip)")
-            continue
-        cmd = [sys.executable, "-m", mod]
-        if args.symbols:
-            cmd += ["--symbols", args.symbols]
-        print("[RUN]", " ".join(cmd))
-        rc = subprocess.call(cmd)
-        if rc != 0:
-            print(f"[ERROR] {f} builder exited {rc}", file=sys.stderr)
-            sys.exit(rc)
+    env = {**os.environ, STAGE_ENV: str(STAGE_DIR)}
+    try:
+        for f in factors:
+            mod = FACTOR_TO_MODULE.get(f)
+            if not mod:
+                print(f"[WARN] Unknown factor '{f}' (skip)")
+                continue
+            if f in READS_FACTORS:
+                flush_staged_factors(STAGE_DIR)
+            cmd = [sys.executable, "-m", mod]
+            if args.symbols:
+                cmd += ["--symbols", args.symbols]
+            print("[RUN]", " ".join(cmd))
+            rc = subprocess.call(cmd, env=env)
+            if rc != 0:
+                print(f"[ERROR] {f} builder exited {rc}", file=sys.stderr)
+                sys.exit(rc)
+    finally:
+        # one factors_latest.csv rewrite for the whole batch
+        flush_staged_factors(STAGE_DIR)
     print("[DONE] factors build complete")
 
 
@@ -5,7 +5,7 @@ from ets.core.env import load_env
 from ets.core.utils import load_yaml, ensure_dirs
 from ets.scripts.prefetch_daily import main as prefetch_main
 from ets.data.providers.provider_registry import ProviderRegistry
-from ets.data.providers.quotes_agg import set_registry, fetch_quote_basic
+from ets.data.providers.quotes_agg import set_registry, fetch_quotes_basic
 
 
 def _ds(d):
@@ -79,9 +79,10 @@ def build_universe():
     reg = ProviderRegistry(cfg)
     set_registry(reg)
     keep = []
+    quotes = fetch_quotes_basic(sorted(symbols))
     for s in sorted(symbols):
         try:
-            q = fetch_quote_basic(s) or {}
+            q = quotes.get(s.upper().strip()) or {}
             last = float(q.get("last") or q.get("close") or 0.0)
             vol = float(q.get("volume") or 0.0)
             if last >= min_price and last * vol >= min_dv:
@@ -3,7 +3,6 @@ from pathlib import Path
 from typing import Dict, Any, List
 import json
 import sys
-import time
 import hashlib
 import datetime as dt
 import pandas as pd
@@ -85,7 +84,6 @@ def ensure_sector_map(
             d.get("finnhubIndustry") or d.get("sector") or ""
         ).strip() or "Unknown"
         rows.append({"symbol": s, "sector": sector})
-        time.sleep(0.05)  # polite on free tier
     if rows:
         dm = pd.concat([dm, pd.DataFrame(rows)], ignore_index=True)
         dm.drop_duplicates(subset=["symbol"], keep="last", inplace=True)
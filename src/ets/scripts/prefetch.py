@@ -4,7 +4,7 @@ import csv
 from datetime import datetime, timedelta
 from ets.core.utils import load_yaml, ensure_dirs
 from ets.data.providers.provider_registry import ProviderRegistry
-from ets.data.providers.quotes_agg import set_registry, fetch_quote_basic
+from ets.data.providers.quotes_agg import set_registry, fetch_quotes_basic
 from ets.data.providers.finnhub_client import earnings_calendar, profile2
 
 
@@ -66,11 +66,11 @@ def main():
             w.writerow([k, v])
 
     # 3) warm sector ETF quotes (improves first-hit latency)
-    for etf in cfg.get("features", {}).get(
+    etfs = cfg.get("features", {}).get(
         "sector_etfs",
         ["SPY", "XLK", "XLY", "XLF", "XLI", "XLE", "XLV", "XLU", "XLB", "XLRE", "XLC"],
-    ):
-        _ = fetch_quote_basic(etf)
+    )
+    fetch_quotes_basic(etfs)
 
     print(
         f"[OK] Prefetched: calendar={len(cal_rows)} sectors_added={len(new_secs)} etf_warmup={len(cfg.get('features', {}).get('sector_etfs', []))}"
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta, UTC
 from ets.core.env import load_env, require_env
 from ets.core.utils import load_yaml, ensure_dirs
 from ets.data.providers.provider_registry import ProviderRegistry
-from ets.data.providers.quotes_agg import set_registry, fetch_quote_basic
+from ets.data.providers.quotes_agg import set_registry, fetch_quotes_basic
 from ets.data.providers.finnhub_client import earnings_calendar, profile2
 
 
@@ -85,14 +85,14 @@ def main(days: int = 7, start: str | None = None):
             w.writerow([k, v])
 
     # 3) warm ETF quotes
-    for etf in cfg.get("features", {}).get(
+    etfs = cfg.get("features", {}).get(
         "sector_etfs",
         ["SPY", "XLK", "XLY", "XLF", "XLI", "XLE", "XLV", "XLU", "XLB", "XLRE", "XLC"],
-    ):
-        try:
-            fetch_quote_basic(etf)
-        except Exception:
-            pass
+    )
+    try:
+        fetch_quotes_basic(etfs)
+    except Exception:
+        pass
 
     # 4) expire trends cache older than 7 days
     tdir = os.path.join("cache", "trends")
@@ -0,0 +1,27 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def write_json_atomic(path: str, obj: Any, **dump_kw) -> None:
+    """
+    json.dump obj to path via a unique temp file in the same directory, then
+    os.replace. mkstemp names are unique per call, so concurrent writers (threads
+    share a pid) never interleave into one temp file; the last replace wins.
+    """
+    d = os.path.dirname(path) or "."
+    os.makedirs(d, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(
+        dir=d, prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, **dump_kw)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
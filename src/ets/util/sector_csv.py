@@ -0,0 +1,36 @@
+import csv
+import warnings
+from functools import lru_cache
+
+import pandas as pd
+
+
+@lru_cache(maxsize=4)
+def read_sector_csv(path: str, mtime: float) -> dict:
+    """
+    TICKER,SECTOR rows (no header) -> {TICKER: sector}; a missing or empty
+    sector reads as "Unknown". mtime is part of the key so a rewritten file
+    is re-parsed.
+    """
+    try:
+        # index_col=False: a 3-field first row must not turn column 0 into the index
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", pd.errors.ParserWarning)
+            df = pd.read_csv(
+                path,
+                header=None,
+                names=["t", "s"],
+                index_col=False,
+                dtype=str,
+                keep_default_na=False,
+            )
+        t, sec = df["t"], df["s"]
+    except pd.errors.ParserError:
+        # ragged rows / stray quotes: row-wise fallback keeps the usable rows
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            rows = [(r[0], r[1] if len(r) > 1 else "") for r in csv.reader(f) if r]
+        t = pd.Series([r[0] for r in rows], dtype=str)
+        sec = pd.Series([r[1] for r in rows], dtype=str)
+    t = t.str.strip().str.upper()
+    sec = sec.str.strip().replace("", "Unknown")
+    return {k: v for k, v in zip(t, sec) if k}
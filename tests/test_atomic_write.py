@@ -0,0 +1,24 @@
+import sys
+import json
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.util.atomic import write_json_atomic
+from ets.data.providers import _filecache
+
+
+def test_concurrent_writers_leave_one_valid_file(tmp_path):
+    path = tmp_path / "sub" / "q.json"
+    payloads = [{"i": i, "pad": "x" * 50_000} for i in range(32)]
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(lambda obj: write_json_atomic(str(path), obj), payloads))
+    assert json.loads(path.read_text()) in payloads
+    assert [p.name for p in path.parent.iterdir()] == ["q.json"]
+
+
+def test_filecache_put_get_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(_filecache, "_ROOT", str(tmp_path))
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(lambda i: _filecache.put("q", "XLK", {"last": 1.5}), range(16)))
+    assert _filecache.get("q", "XLK", ttl=60) == {"last": 1.5}
@@ -0,0 +1,21 @@
+import sys
+import pathlib
+import datetime as dt
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.scripts import build_factor_cal_raw as cal
+
+
+def test_days_until_uses_the_run_date():
+    # same event date, two runs on different days: no import-time date leaks in
+    assert cal._days_until("2025-01-10", dt.date(2025, 1, 2)) == 8
+    assert cal._days_until("2025-01-10", dt.date(2025, 1, 9)) == 1
+    assert cal._days_until("2025-01-10", dt.date(2025, 1, 12)) == 0
+    assert cal._days_until("", dt.date(2025, 1, 2)) == 9999
+
+
+def test_stale_check_uses_the_run_date():
+    now = dt.datetime(2025, 1, 12, tzinfo=dt.timezone.utc)
+    row = {"date": "2025-01-10", "checked_at": "2025-01-09T00:00:00Z"}
+    assert not cal._is_stale(row, now, dt.date(2025, 1, 2))
+    assert cal._is_stale(row, now, now.date())
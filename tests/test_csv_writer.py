@@ -0,0 +1,29 @@
+import sys
+import pathlib
+
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.outputs import csv_writer as cw
+
+
+def test_factors_csv_matches_pandas_formatting(tmp_path):
+    rows = [
+        {"ticker": "AAPL", "last": 0.0, "EPS_raw": 1e-05, "sector": "Tech, Hardware"},
+        {"ticker": "MSFT", "last": 412.5, "EPS_raw": None, "sector": "Software"},
+    ]
+    path = tmp_path / "out" / "factors.csv"
+    cw.write_factors(str(path), rows)
+    assert path.read_text() == pd.DataFrame(rows).to_csv(index=False)
+    head = path.read_text().splitlines()[:2]
+    assert head == ["ticker,last,EPS_raw,sector", 'AAPL,0.0,1e-05,"Tech, Hardware"']
+
+
+def test_failed_parquet_write_removes_stale_sibling(tmp_path, monkeypatch):
+    path = tmp_path / "out" / "2025-01-02_amc_factors.csv"
+    stale = path.with_suffix(".parquet")
+    stale.parent.mkdir(parents=True)
+    stale.write_bytes(b"previous run")
+    monkeypatch.setattr(cw, "write_parquet", lambda p, rows: False)
+    cw.write_factors(str(path), [{"ticker": "AAPL", "last": 1.0}])
+    assert path.exists() and not stale.exists()
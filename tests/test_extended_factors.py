@@ -0,0 +1,148 @@
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.data.signals import extended_factors as ef
+
+
+def test_last_price_caches_successes_only(monkeypatch):
+    answers = {"AAA": [None, 12.5], "BBB": [7.0]}
+    calls = []
+
+    def fake(sym):
+        calls.append(sym)
+        return answers[sym].pop(0)
+
+    monkeypatch.setattr(ef, "_fetch_last_price", fake)
+    monkeypatch.setattr(ef, "_PRICE_CACHE", {})
+    assert ef._last_price("AAA") is None
+    assert ef._last_price("AAA") == 12.5  # the miss was not memoized
+    assert ef._last_price("AAA") == 12.5
+    assert ef._last_price("BBB") == 7.0
+    assert ef._last_price("BBB") == 7.0
+    assert calls == ["AAA", "AAA", "BBB"]
+
+
+def test_last_price_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ef.time, "time", lambda: now[0])
+    monkeypatch.setattr(ef, "_PRICE_CACHE", {})
+    seq = iter([1.0, 2.0])
+    monkeypatch.setattr(ef, "_fetch_last_price", lambda sym: next(seq))
+    assert ef._last_price("AAA") == 1.0
+    now[0] += ef._PRICE_TTL + 1
+    assert ef._last_price("AAA") == 2.0
+
+
+def test_factor_macro_does_not_memoize_failures(monkeypatch):
+    import pandas as pd
+
+    calls = []
+
+    def fake_download(*a, **kw):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("yahoo down")
+        cols = pd.MultiIndex.from_product([["XLY", "XLU"], ["Close"]])
+        return pd.DataFrame([[100.0, 50.0], [102.0, 50.0]], columns=cols)
+
+    monkeypatch.setattr(ef.yf, "download", fake_download)
+    monkeypatch.setattr(ef, "_MACRO_CACHE", {"t": 0.0, "v": None})
+    assert ef.factor_macro() == {"RISK_APP": None}
+    got = ef.factor_macro()
+    assert abs(got["RISK_APP"] - 0.02) < 1e-12
+    assert ef.factor_macro() == got
+    assert len(calls) == 2
+
+
+def test_bulk_injects_last_prices_into_options_skew(monkeypatch):
+    seen = {}
+    monkeypatch.setattr(ef, "bulk_last_prices", lambda syms: {"AAA": 10.0})
+    monkeypatch.setattr(ef, "_earnings_calendar_today", lambda: None)
+    monkeypatch.setattr(ef, "_finnhub_factors", lambda sym, cal: {"INSIDER": None})
+
+    def fake_skew(sym, last_price=None):
+        seen[sym] = last_price
+        return {"OPT_SK": 0.0}
+
+    monkeypatch.setattr(ef, "factor_options_skew", fake_skew)
+    out = ef.compute_extended_factors_bulk(["AAA", "BBB", "AAA"])
+    assert list(out) == ["AAA", "BBB"]
+    assert out["AAA"] == {"INSIDER": None, "OPT_SK": 0.0}
+    assert seen == {"AAA": 10.0, "BBB": None}
+
+
+def test_bulk_last_prices_downloads_one_chunk_at_a_time(monkeypatch):
+    import threading
+    import pandas as pd
+
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def fake_download(chunk, **kw):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        cols = pd.MultiIndex.from_product([chunk, ["Close"]])
+        df = pd.DataFrame([[1.0] * len(chunk)], columns=cols)
+        with lock:
+            active[0] -= 1
+        return df
+
+    monkeypatch.setattr(ef.yf, "download", fake_download)
+    syms = [f"S{i}" for i in range(45)]
+    assert ef.bulk_last_prices(syms) == {s: 1.0 for s in syms}
+    assert peak[0] == 1
+
+
+def test_bulk_gates_finnhub_and_fetches_calendar_once(monkeypatch):
+    import types
+    from ets.data.signals import _httpcache
+
+    urls, acquired = [], []
+
+    class Resp:
+        status_code = 200
+
+        def __init__(self, url):
+            self.url = url
+
+        def json(self):
+            if self.url.endswith("/calendar/earnings"):
+                return {"earningsCalendar": [{"symbol": "AAA", "hour": "amc"}]}
+            return {}
+
+    def fake_get(url, params=None, timeout=None):
+        urls.append(url)
+        return Resp(url)
+
+    limiter = types.SimpleNamespace(acquire=lambda cost=1: acquired.append(1))
+    monkeypatch.setenv("FINNHUB_API_KEY", "k")
+    monkeypatch.setattr(_httpcache._filecache, "get", lambda ns, key, ttl: None)
+    monkeypatch.setattr(_httpcache._filecache, "put", lambda ns, key, data: None)
+    monkeypatch.setattr(_httpcache._SESSION, "get", fake_get)
+    monkeypatch.setattr(ef, "_REG", types.SimpleNamespace(finnhub={"limiter": limiter}))
+    monkeypatch.setattr(ef, "bulk_last_prices", lambda syms: {})
+    monkeypatch.setattr(ef, "factor_options_skew", lambda sym, last=None: {})
+
+    out = ef.compute_extended_factors_bulk(["AAA", "BBB", "CCC"])
+    assert out["AAA"]["EAT"] == 1.0 and out["BBB"]["EAT"] is None
+    assert sum(u.endswith("/calendar/earnings") for u in urls) == 1
+    assert len(urls) == 1 + 2 * 3  # calendar once, insider + news per symbol
+    assert len(acquired) == len(urls)
+
+
+def test_info_cache_skips_failed_lookups(monkeypatch):
+    answers = [{}, {"returnOnEquity": 0.2}]
+    calls = []
+
+    def fake_info(t):
+        calls.append(t)
+        return answers.pop(0)
+
+    monkeypatch.setattr(ef, "_yf_info", fake_info)
+    monkeypatch.setattr(ef, "_ticker", lambda sym: sym)
+    monkeypatch.setattr(ef, "_INFO_CACHE", {})
+    assert ef._info_cached("AAA") == {}
+    assert ef._info_cached("AAA") == {"returnOnEquity": 0.2}
+    assert ef._info_cached("AAA") == {"returnOnEquity": 0.2}
+    assert calls == ["AAA", "AAA"]
@@ -0,0 +1,52 @@
+import sys
+import os
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.core import factor_cache as fc
+
+
+def _counter(row):
+    calls = []
+
+    def compute(t):
+        calls.append(t)
+        return dict(row)
+
+    return compute, calls
+
+
+def test_success_row_is_cached(tmp_path):
+    compute, calls = _counter({"ticker": "AAPL", "last": 190.5, "EPS_raw": 0.1})
+    a = fc.load_or_compute("aapl", compute, "2025-01-02", "amc", str(tmp_path))
+    b = fc.load_or_compute("AAPL", compute, "2025-01-02", "amc", str(tmp_path))
+    assert a == b and len(calls) == 1
+    assert os.path.exists(fc.row_path(str(tmp_path), "2025-01-02", "amc", "AAPL"))
+
+
+def test_failed_quote_row_is_not_cached(tmp_path):
+    # all-zero row from a failed quote is truthy but must be recomputed next time
+    compute, calls = _counter({"ticker": "AAPL", "last": 0.0, "EPS_raw": 0.0})
+    for _ in range(2):
+        fc.load_or_compute("AAPL", compute, "2025-01-02", "amc", str(tmp_path))
+    assert len(calls) == 2
+    assert not (tmp_path / "factors").exists()
+
+
+def test_sessions_do_not_share_rows(tmp_path):
+    compute, calls = _counter({"ticker": "AAPL", "last": 190.5})
+    fc.load_or_compute("AAPL", compute, "2025-01-02", "amc", str(tmp_path))
+    fc.load_or_compute("AAPL", compute, "2025-01-02", "bmo", str(tmp_path))
+    assert len(calls) == 2
+
+
+def test_dry_and_no_cache_disable_cache(tmp_path):
+    assert fc.cache_root(str(tmp_path), dry=True) is None
+    assert fc.cache_root(str(tmp_path), no_cache=True) is None
+    assert fc.cache_root(str(tmp_path)) == str(tmp_path)
+    compute, calls = _counter({"ticker": "AAPL", "last": 190.5})
+    root = fc.cache_root(str(tmp_path), dry=True)
+    for _ in range(2):
+        fc.load_or_compute("AAPL", compute, "2025-01-02", "amc", root)
+    assert len(calls) == 2
+    assert list(tmp_path.iterdir()) == []
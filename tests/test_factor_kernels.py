@@ -0,0 +1,132 @@
+import sys
+import pathlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.scripts import build_factor_a_raw as a_raw
+from ets.scripts import build_factor_m_raw as m_raw
+from ets.scripts import build_factor_sigma_raw as sigma_raw
+from ets.scripts import build_factor_srm_raw as srm_raw
+from ets.scripts import build_factor_tau_raw as tau_raw
+from ets.scripts import build_factor_v_raw as v_raw
+
+# Reference: the per-symbol pandas kernels the batched versions replaced.
+
+
+def _ref_m(close, window):
+    close = close.dropna()
+    if len(close) <= window:
+        return 0.0
+    c_t, c_w = float(close.iloc[-1]), float(close.iloc[-(window + 1)])
+    if c_t <= 0 or c_w <= 0:
+        return 0.0
+    return float(np.log(c_t / c_w))
+
+
+def _ref_sigma(close, window):
+    c = close.dropna().astype(float)
+    if len(c) <= window:
+        return 0.0
+    s = float(np.log(c / c.shift(1)).dropna().tail(window).std(ddof=0))
+    return s if np.isfinite(s) else 0.0
+
+
+def _ref_tau(close, window):
+    c = close.dropna().astype(float)
+    if len(c) < window:
+        return 0.0
+    sma, std = float(c.tail(window).mean()), float(c.tail(window).std(ddof=0))
+    tau = -(float(c.iloc[-1]) - sma) / max(std, 1e-9)
+    return float(tau) if np.isfinite(tau) else 0.0
+
+
+def _ref_v(volume, window):
+    v = volume.dropna()
+    if len(v) < window + 1:
+        return 0.0
+    base = float(v.iloc[-(window + 1) : -1].median())
+    if base <= 0:
+        return 0.0
+    return float(v.iloc[-1]) / base - 1.0
+
+
+def _ref_a(close):
+    c = close.dropna().astype(float)
+    if len(c) < 3:
+        return 0.0
+    r = np.log(c / c.shift(1))
+    a = r.iloc[-1] - r.iloc[-2]
+    return float(a) if np.isfinite(a) else 0.0
+
+
+def _ref_log_return(close, window):
+    c = close.dropna().astype(float)
+    if len(c) <= window:
+        return 0.0
+    return float(np.log(c.iloc[-1] / c.iloc[-(window + 1)]))
+
+
+def _series():
+    rng = np.random.default_rng(7)
+    out = {}
+    for i, n in enumerate((0, 1, 2, 3, 9, 10, 11, 19, 20, 21, 30, 45)):
+        c = 50.0 * np.exp(np.cumsum(rng.normal(0.0, 0.03, n)))
+        if n > 15:
+            c[rng.choice(n - 1, 3, replace=False)] = np.nan  # gaps mid-window
+        out[f"S{i:02d}"] = pd.Series(c, index=pd.bdate_range("2025-01-01", periods=n))
+    return out
+
+
+def _check(got, ref):
+    assert list(got) == list(ref)
+    np.testing.assert_allclose(
+        np.array(list(got.values())), np.array(list(ref.values())), rtol=1e-10
+    )
+
+
+def test_m_raw_batch_parity():
+    closes = _series()
+    closes["ZERO"] = pd.Series([0.0] + [10.0] * 12)
+    _check(
+        m_raw.compute_m_raw_batch(closes, 10),
+        {s: _ref_m(c, 10) for s, c in closes.items()},
+    )
+
+
+def test_sigma_raw_batch_parity():
+    closes = _series()
+    _check(
+        sigma_raw.compute_sigma_raw_batch(closes, 10),
+        {s: _ref_sigma(c, 10) for s, c in closes.items()},
+    )
+
+
+def test_tau_raw_batch_parity():
+    closes = _series()
+    _check(
+        tau_raw.compute_tau_raw_batch(closes, 20),
+        {s: _ref_tau(c, 20) for s, c in closes.items()},
+    )
+
+
+def test_v_raw_batch_parity():
+    vols = {s: c * 1e4 for s, c in _series().items()}
+    vols["FLAT0"] = pd.Series([0.0] * 21 + [5.0])  # empty baseline -> 0.0
+    _check(
+        v_raw.compute_v_raw_batch(vols, 20),
+        {s: _ref_v(v, 20) for s, v in vols.items()},
+    )
+
+
+def test_a_raw_batch_parity():
+    closes = _series()
+    _check(a_raw.compute_a_raw_batch(closes), {s: _ref_a(c) for s, c in closes.items()})
+
+
+def test_srm_log_return_batch_parity():
+    closes = list(_series().values())
+    got = srm_raw.log_return_batch(closes, 10)
+    ref = [_ref_log_return(c, 10) for c in closes]
+    np.testing.assert_allclose(got, ref, rtol=1e-10)
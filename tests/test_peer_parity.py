@@ -0,0 +1,92 @@
+import sys
+import pathlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.factors.returns import log_rets_np
+from ets.scripts import build_factor_peer_raw as peer
+
+
+def _log_rets(close: pd.Series) -> pd.Series:
+    c = close.dropna().astype(float)
+    return np.log(c / c.shift(1))
+
+
+def _frame(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end="2025-01-31", periods=n)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, n)))
+    return pd.DataFrame({"Close": close}, index=idx)
+
+
+def _reference(symbols, sectors, frames, window, max_peers):
+    # pre-vectorisation PEER_raw loop
+    prof = pd.DataFrame({"symbol": list(sectors), "sector": list(sectors.values())})
+    peers_by = {
+        sec: sorted(sdf["symbol"].unique().tolist())
+        for sec, sdf in prof.groupby("sector")
+    }
+    vals = {}
+    for s in symbols:
+        peers = [p for p in peers_by.get(sectors[s], []) if p != s][:max_peers]
+        if len(peers) < 2:
+            vals[s] = 0.0
+            continue
+        r_s = _log_rets(frames[s]["Close"]).tail(window)
+        mat = [
+            _log_rets(frames[p]["Close"]).tail(window).reset_index(drop=True)
+            for p in peers
+            if p in frames
+        ]
+        if len(mat) < 2:
+            vals[s] = 0.0
+            continue
+        med = pd.concat(mat, axis=1).median(axis=1)
+        if r_s.isna().all() or med.isna().all():
+            vals[s] = 0.0
+            continue
+        c = r_s.reset_index(drop=True).corr(med, method="pearson")
+        vals[s] = float(0.0 if np.isnan(c) else c)
+    return vals
+
+
+def test_log_rets_np_matches_pandas_tail():
+    for n in (0, 1, 2, 5, 20, 21, 40):
+        close = _frame(n, n)["Close"] if n else pd.Series([], dtype=float)
+        want = _log_rets(close).tail(20).to_numpy()
+        np.testing.assert_array_equal(np.isnan(log_rets_np(close, 20)), np.isnan(want))
+        np.testing.assert_allclose(log_rets_np(close, 20), want, equal_nan=True)
+
+
+def test_peer_raw_parity_with_short_history_peer(monkeypatch):
+    # SHRT has only 8 bars: its NaN slot must stay at the front of the window
+    lengths = {"AAA": 45, "BBB": 45, "CCC": 45, "SHRT": 8, "DDD": 45, "EEE": 12}
+    frames = {s: _frame(n, i) for i, (s, n) in enumerate(lengths.items())}
+    sectors = {"AAA": "Tech", "BBB": "Tech", "CCC": "Tech", "SHRT": "Tech"}
+    sectors.update({"DDD": "Energy", "EEE": "Energy"})
+    symbols = sorted(frames)
+    got = {}
+
+    monkeypatch.setattr(peer, "read_symbols", lambda _: symbols)
+    monkeypatch.setattr(
+        peer,
+        "load_sector_profile",
+        lambda: pd.DataFrame(
+            {"symbol": list(sectors), "sector": list(sectors.values())}
+        ),
+    )
+    monkeypatch.setattr(peer, "load_daily_cache", lambda s: frames.get(s))
+    monkeypatch.setattr(peer, "is_fresh", lambda df, n: df is not None)
+    monkeypatch.setattr(
+        peer, "update_factors_csv", lambda syms, col, vals: got.update(vals)
+    )
+    monkeypatch.setattr(sys, "argv", ["build_factor_peer_raw", "--window", "20"])
+    peer.main()
+
+    want = _reference(symbols, sectors, frames, window=20, max_peers=10)
+    assert set(got) == set(want)
+    for s in symbols:
+        assert abs(got[s] - want[s]) < 1e-12, s
+    assert any(abs(v) > 0 for v in want.values())
@@ -0,0 +1,23 @@
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.data.signals import sector_autofill as sa
+
+
+def test_load_has_no_side_effects(tmp_path):
+    d = tmp_path / "cache"
+    assert sa.load_sector_cache(str(d)) == {}
+    assert not d.exists()
+    d.mkdir()
+    (d / "sectors.csv").write_text("AAPL,Technology\nNA,Utilities\nMSFT\n")
+    assert sa.load_sector_cache(str(d)) == {"AAPL": "Technology", "NA": "Utilities"}
+    assert [p.name for p in d.iterdir()] == ["sectors.csv"]
+
+
+def test_save_replaces_the_csv(tmp_path):
+    d = tmp_path / "cache"
+    sa.save_sector_cache({"MSFT": "Software", "AAPL": "Technology"}, str(d))
+    sa.save_sector_cache({"AAPL": "Hardware"}, str(d))
+    assert (d / "sectors.csv").read_text() == "AAPL,Hardware\n"
+    assert sa.load_sector_cache(str(d)) == {"AAPL": "Hardware"}
@@ -0,0 +1,29 @@
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.util.sector_csv import read_sector_csv
+
+
+def _read(tmp_path, text, name="sectors.csv"):
+    p = tmp_path / name
+    p.write_text(text)
+    return read_sector_csv(str(p), p.stat().st_mtime)
+
+
+def test_three_field_first_row_keeps_ticker_column(tmp_path):
+    got = _read(tmp_path, "AAPL,Tech,x\nMSFT,Soft\n")
+    assert got == {"AAPL": "Tech", "MSFT": "Soft"}
+
+
+def test_ragged_later_rows_fall_back_row_wise(tmp_path):
+    got = _read(tmp_path, "AAPL,Tech\nMSFT,Soft,x\n\n  ko , Bev \n")
+    assert got == {"AAPL": "Tech", "MSFT": "Soft", "KO": "Bev"}
+
+
+def test_one_column_and_empty_sectors_read_unknown(tmp_path):
+    assert _read(tmp_path, "AAPL\nNA\n") == {"AAPL": "Unknown", "NA": "Unknown"}
+    assert _read(tmp_path, "AAPL,\nMSFT,Soft\n", "b.csv") == {
+        "AAPL": "Unknown",
+        "MSFT": "Soft",
+    }
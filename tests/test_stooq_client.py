@@ -0,0 +1,51 @@
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.data.providers import stooq_client as sc
+
+_HDR = "Date,Open,High,Low,Close,Volume"
+
+
+class _Resp:
+    def __init__(self, text, status=200):
+        self.text, self.status_code = text, status
+
+
+def _fake(monkeypatch, reply):
+    urls = []
+
+    def get(url, headers=None, timeout=None):
+        urls.append(url)
+        return reply(url)
+
+    monkeypatch.setattr(sc._SESSION, "get", get)
+    monkeypatch.setattr(sc.time, "sleep", lambda s: None)
+    return urls
+
+
+def test_unknown_symbol_costs_one_request_per_candidate(monkeypatch):
+    urls = _fake(monkeypatch, lambda url: _Resp("No data"))
+    assert sc._try_stooq("ZZZZ") is None
+    assert len(urls) == 2 and all("&d1=" in u for u in urls)
+
+
+def test_404_does_not_fall_back_to_full_history(monkeypatch):
+    urls = _fake(monkeypatch, lambda url: _Resp("404 Not Found", 404))
+    assert sc._try_stooq("ZZZZ") is None
+    assert len(urls) == 2
+
+
+def test_bare_header_window_falls_back_to_full_history(monkeypatch):
+    full = f"{_HDR}\n2020-01-02,1,2,0.5,1.5,100\n"
+    urls = _fake(monkeypatch, lambda url: _Resp(_HDR if "&d1=" in url else full))
+    bar = sc._try_stooq("AAPL")
+    assert bar == {"open": 1.0, "high": 2.0, "low": 0.5, "last": 1.5, "volume": 100.0}
+    assert len(urls) == 2 and "&d1=" not in urls[1]
+
+
+def test_windowed_hit_is_a_single_request(monkeypatch):
+    text = f"{_HDR}\n2025-01-02,1,2,0.5,1.5,100\n2025-01-03,2,3,1,2.5,200\n"
+    urls = _fake(monkeypatch, lambda url: _Resp(text))
+    assert sc._try_stooq("AAPL")["last"] == 2.5
+    assert len(urls) == 1
@@ -0,0 +1,64 @@
+import sys
+import pathlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.scripts import build_factor_vix_raw as vix
+
+
+def _frame(dates, seed):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, len(dates))))
+    return pd.DataFrame({"Close": close}, index=dates)
+
+
+def _reference(symbols, frames, vix_df, window):
+    # pre-vectorisation VIX_raw loop: Series.corr aligns on the Date index
+    dvix = vix_df["Close"].dropna().astype(float).diff().tail(window)
+    vals = {}
+    for s in symbols:
+        c = frames[s]["Close"].dropna().astype(float)
+        r = np.log(c / c.shift(1)).tail(window)
+        if len(r) != len(dvix) or r.isna().all() or dvix.isna().all():
+            vals[s] = 0.0
+            continue
+        corr = r.corr(dvix, method="pearson")
+        vals[s] = float(0.0 if np.isnan(corr) else corr)
+    return vals
+
+
+def test_vix_raw_parity_with_stale_and_gappy_symbols(monkeypatch):
+    days = pd.bdate_range(end="2025-01-31", periods=30)
+    vix_df = _frame(days, 99)
+    # drive AAA/LAG off the VIX deltas so the correlation is far from zero
+    base = np.diff(vix_df["Close"].to_numpy())
+    lead = np.concatenate(([100.0], 100.0 * np.exp(np.cumsum(-0.01 * base))))
+    frames = {
+        "AAA": pd.DataFrame({"Close": lead}, index=days),
+        # cache one business day behind ^VIX (is_fresh still accepts it)
+        "LAG": pd.DataFrame({"Close": lead[:-1]}, index=days[:-1]),
+        "GAP": _frame(days, 1),
+        "SHRT": _frame(days[-6:], 2),
+    }
+    frames["GAP"].iloc[-4, 0] = np.nan
+    symbols = sorted(frames)
+    got = {}
+
+    monkeypatch.setattr(vix, "read_symbols", lambda _: symbols)
+    monkeypatch.setattr(
+        vix, "load_daily_cache", lambda s: vix_df if s == "^VIX" else frames.get(s)
+    )
+    monkeypatch.setattr(vix, "is_fresh", lambda df, n: df is not None)
+    monkeypatch.setattr(
+        vix, "update_factors_csv", lambda syms, col, vals: got.update(vals)
+    )
+    monkeypatch.setattr(sys, "argv", ["build_factor_vix_raw", "--window", "10"])
+    vix.main()
+
+    want = _reference(symbols, frames, vix_df, window=10)
+    assert set(got) == set(want)
+    for s in symbols:
+        assert abs(got[s] - want[s]) < 1e-12, s
+    assert want["LAG"] < -0.5
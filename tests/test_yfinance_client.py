@@ -0,0 +1,32 @@
+import sys
+import pathlib
+import logging
+
+import pandas as pd
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "src"))
+from ets.data.providers import yfinance_client as yc
+
+
+def _frame():
+    return pd.DataFrame(
+        {"Open": [1.0], "High": [2.0], "Low": [0.5], "Close": [1.5], "Volume": [10.0]}
+    )
+
+
+def test_download_leaves_process_streams_alone(monkeypatch):
+    out, err = sys.stdout, sys.stderr
+    seen = []
+
+    def fake_download(**kw):
+        seen.append((sys.stdout is out, sys.stderr is err))
+        return _frame()
+
+    monkeypatch.setattr(yc.yf, "download", fake_download)
+    assert yc._one_download("AAPL")["last"] == 1.5
+    assert seen == [(True, True)]
+
+
+def test_yfinance_logging_silenced_at_import():
+    for name in ("yfinance", "peewee"):
+        assert logging.getLogger(name).level == logging.CRITICAL